@@ -0,0 +1,10 @@
+"""
+Benchmarks of the conversion stages on generated workbooks::
+
+    python -m benchmarks run --output before.json
+    git checkout my-branch
+    python -m benchmarks run --output after.json
+    python -m benchmarks compare before.json after.json
+
+See ``python -m benchmarks --help``.
+"""
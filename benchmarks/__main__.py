@@ -0,0 +1,102 @@
+import argparse
+import sys
+
+from .compare import compare_results, format_comparison, load_results
+from .generate import FORMATS, generate_workbook
+from .imports import IMPORTS
+from .run import CASES, MODES, STAGES, format_result, run_benchmarks, save_results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("-o", "--output", help="save the results as json")
+    run.add_argument("--case", action="append", choices=list(CASES))
+    run.add_argument("--stage", action="append", choices=list(STAGES))
+    run.add_argument("--mode", action="append", choices=list(MODES))
+    run.add_argument("--scale", type=float, default=1.0, help="multiply rows, e.g. 0.1")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--dir", help="directory of the generated workbooks")
+    run.add_argument(
+        "--imports", action="store_true", help="also time the imports of the package"
+    )
+
+    imports = commands.add_parser(
+        "imports", help="time the imports of the package, the slowest modules"
+    )
+    imports.add_argument("-o", "--output", help="save the results as json")
+    imports.add_argument("--repeat", type=int, default=5)
+
+    compare = commands.add_parser("compare", help="compare two results files")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument(
+        "--threshold", type=float, default=0.1, help="relative change to report"
+    )
+    compare.add_argument(
+        "--fail-slower", action="store_true", help="exit with 1 if any stage is slower"
+    )
+
+    generate = commands.add_parser("generate", help="save a synthetic workbook")
+    generate.add_argument("output")
+    generate.add_argument("--rows", type=int, default=1000)
+    generate.add_argument("--columns", type=int, default=20)
+    generate.add_argument("--styles", type=int, default=0)
+    generate.add_argument("--merge-density", type=float, default=0.0)
+    generate.add_argument(
+        "--formats", default="general", help="comma separated: %s" % ",".join(FORMATS)
+    )
+    generate.add_argument("--hyperlink-density", type=float, default=0.0)
+    generate.add_argument("--images", type=int, default=0)
+    generate.add_argument("--seed", type=int, default=0)
+
+    options = parser.parse_args(args)
+    if options.command == "run":
+        results = run_benchmarks(
+            cases=options.case,
+            stages=options.stage,
+            modes=options.mode,
+            scale=options.scale,
+            repeat=options.repeat,
+            directory=options.dir,
+            seed=options.seed,
+            progress=lambda key, result: print(format_result(key, result)),
+            imports=list(IMPORTS) if options.imports else (),
+        )
+        if options.output:
+            save_results(results, options.output)
+    elif options.command == "imports":
+        results = run_benchmarks(cases=(), repeat=options.repeat, imports=list(IMPORTS))
+        for key, result in results["results"].items():
+            print(format_result(key, result))
+            for module, seconds in result["slowest"]:
+                print("  %8.3fs %s" % (seconds, module))
+        if options.output:
+            save_results(results, options.output)
+    elif options.command == "compare":
+        base = load_results(options.base)
+        new = load_results(options.new)
+        rows = compare_results(base, new, threshold=options.threshold)
+        print(format_comparison(rows, base["meta"], new["meta"]))
+        if options.fail_slower and any(row[-1] == "slower" for row in rows):
+            return 1
+    else:
+        generate_workbook(
+            options.output,
+            rows=options.rows,
+            columns=options.columns,
+            styles=options.styles,
+            merge_density=options.merge_density,
+            formats=options.formats.split(","),
+            hyperlink_density=options.hyperlink_density,
+            images=options.images,
+            seed=options.seed,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
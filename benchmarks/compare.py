@@ -0,0 +1,59 @@
+"""Compare two results files of :func:`benchmarks.run.run_benchmarks`"""
+
+import json
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(base, new, threshold=0.1):
+    """
+    Return ``[(key, base seconds, new seconds, change, status)]`` of the
+    stages in both files. ``change`` is relative to the base time,
+    ``None`` if the base time is ``0``. ``status`` is ``"slower"``
+    or ``"faster"`` beyond ``threshold``.
+
+    >>> base = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}}
+    >>> new = {"results": {"a": {"seconds": 1.5}, "b": {"seconds": 0.95}}}
+    >>> compare_results(base, new)
+    [('a', 1.0, 1.5, 0.5, 'slower'), ('b', 1.0, 0.95, -0.05, '')]
+    >>> compare_results({"results": {"a": {"seconds": 0.0}}}, base)
+    [('a', 0.0, 1.0, None, '')]
+    """
+    rows = []
+    for key, base_result in base["results"].items():
+        new_result = new["results"].get(key)
+        if new_result is None:
+            continue
+        base_seconds = base_result["seconds"]
+        new_seconds = new_result["seconds"]
+        change = None
+        status = ""
+        # Rounded to 0 for a stage faster than the timer
+        if base_seconds:
+            change = round((new_seconds - base_seconds) / base_seconds, 4)
+            if change > threshold:
+                status = "slower"
+            elif change < -threshold:
+                status = "faster"
+        rows.append((key, base_seconds, new_seconds, change, status))
+    return rows
+
+
+def format_comparison(rows, base_meta=None, new_meta=None):
+    lines = []
+    if base_meta and new_meta:
+        lines.append("%s -> %s" % (base_meta.get("revision"), new_meta.get("revision")))
+    for key, base_seconds, new_seconds, change, status in rows:
+        if change is None:
+            # No base time to compare with, the difference in seconds
+            change = "%+7.3fs" % (new_seconds - base_seconds)
+        else:
+            change = "%+7.1f%%" % (change * 100)
+        lines.append(
+            "%-40s %8.3fs %8.3fs %s %s"
+            % (key, base_seconds, new_seconds, change, status)
+        )
+    return "\n".join(lines)
@@ -0,0 +1,144 @@
+"""
+Reproducible synthetic workbooks: the same arguments and seed
+always give the same cells, styles, merges, hyperlinks and images.
+"""
+
+import datetime
+import io
+import random
+
+import openpyxl
+from openpyxl.drawing.image import Image
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+EPOCH = datetime.datetime(2000, 1, 1)
+
+
+def random_date(rng):
+    return (EPOCH + datetime.timedelta(days=rng.randint(0, 10000))).date()
+
+
+def random_datetime(rng):
+    return EPOCH + datetime.timedelta(minutes=rng.randint(0, 10**7))
+
+
+def random_time(rng):
+    return datetime.time(rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))
+
+
+# name: (number format, value factory)
+FORMATS = {
+    "general": ("General", lambda rng: rng.randint(-1000, 100000)),
+    "text": ("General", lambda rng: "text %s" % rng.randint(0, 100000)),
+    "number": ("#,##0.00", lambda rng: rng.uniform(-1e6, 1e6)),
+    "percent": ("0.00%", lambda rng: rng.random()),
+    "currency": (
+        "_(\\$* #,##0.00_);_(\\$* \\(#,##0.00\\);_(\\$* \\-??_);_(@_)",
+        lambda rng: rng.uniform(-1e4, 1e4),
+    ),
+    "date": ("yyyy-mm-dd", random_date),
+    "datetime": ("m/d/yy h:mm", random_datetime),
+    "time": ("h:mm:ss AM/PM", random_time),
+    "duration": (
+        "[h]:mm:ss",
+        lambda rng: datetime.timedelta(seconds=rng.randint(0, 10**6)),
+    ),
+}
+
+BORDER_STYLES = ["thin", "medium", "dashed", "dotted", "double"]
+
+
+def make_styles(count, rng):
+    """Return ``count`` distinct (font, fill, border, alignment) combinations"""
+    styles = []
+    for i in range(count):
+        color = "%06X" % rng.randint(0, 0xFFFFFF)
+        side = Side(style=BORDER_STYLES[i % len(BORDER_STYLES)], color=color)
+        styles.append(
+            (
+                Font(bold=bool(i % 2), italic=bool(i % 3 == 0), size=9 + i % 6),
+                PatternFill("solid", fgColor=color),
+                Border(left=side, right=side, top=side, bottom=side),
+                Alignment(horizontal=["left", "center", "right"][i % 3]),
+            )
+        )
+    return styles
+
+
+def make_image(rng):
+    from PIL import Image as PILImage
+
+    color = tuple(rng.randint(0, 255) for _ in range(3))
+    fp = io.BytesIO()
+    PILImage.new("RGB", (32, 24), color).save(fp, "png")
+    fp.seek(0)
+    return fp
+
+
+def generate_workbook(
+    path,
+    rows=1000,
+    columns=20,
+    styles=0,
+    merge_density=0.0,
+    formats=("general",),
+    hyperlink_density=0.0,
+    images=0,
+    seed=0,
+):
+    """
+    Save a workbook of ``rows`` x ``columns`` cells to ``path``.
+
+    :param styles: number of distinct cell styles, ``0`` - default style only
+    :param merge_density: share of rows with a merged range
+    :param formats: names of :data:`FORMATS`, given to the columns in turn
+    :param hyperlink_density: share of cells with a hyperlink
+    :param images: number of images, 4 distinct ones repeated
+    """
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    style_list = make_styles(styles, rng)
+    column_formats = [FORMATS[formats[i % len(formats)]] for i in range(columns)]
+    for col in range(1, columns + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 8 + col % 10
+
+    for row in range(1, rows + 1):
+        for col, (number_format, make_value) in enumerate(column_formats, 1):
+            cell = ws.cell(row=row, column=col, value=make_value(rng))
+            cell.number_format = number_format
+            if style_list:
+                cell.font, cell.fill, cell.border, cell.alignment = rng.choice(
+                    style_list
+                )
+            if hyperlink_density and rng.random() < hyperlink_density:
+                cell.hyperlink = "https://example.com/%s/%s" % (row, col)
+
+    merged_rows = set()
+    for row in range(1, rows):
+        if merge_density and rng.random() < merge_density and row not in merged_rows:
+            height = rng.randint(1, 2)
+            min_col = rng.randint(1, max(columns - 2, 1))
+            max_col = min(min_col + rng.randint(1, 2), columns)
+            ws.merge_cells(
+                start_row=row,
+                start_column=min_col,
+                end_row=min(row + height - 1, rows),
+                end_column=max_col,
+            )
+            merged_rows.update(range(row, row + height))
+
+    image_files = [make_image(rng) for _ in range(min(images, 4))]
+    for i in range(images):
+        fp = image_files[i % len(image_files)]
+        fp.seek(0)
+        anchor = "%s%s" % (
+            get_column_letter(rng.randint(1, columns)),
+            rng.randint(1, rows),
+        )
+        ws.add_image(Image(io.BytesIO(fp.read())), anchor)
+
+    wb.save(path)
+    return path
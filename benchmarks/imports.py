@@ -0,0 +1,96 @@
+"""
+Import time of the package in a fresh interpreter, from
+``python -X importtime``: the cold start of each CLI run or serverless call.
+"""
+
+import os
+import subprocess
+import sys
+
+import xlsx2html
+
+# name: statement
+IMPORTS = {
+    "package": "import xlsx2html",
+    # What the CLI imports before converting
+    "core": "from xlsx2html import xlsx2html",
+}
+
+
+def parse_importtime(output):
+    """
+    Return ``[(module, depth, self seconds, cumulative seconds)]``
+
+    >>> parse_importtime('''import time: self [us] | cumulative | imported package
+    ... import time:       409 |        409 |   warnings
+    ... import time:      2274 |       2682 | xlsx2html''')
+    [('warnings', 1, 0.000409, 0.000409), ('xlsx2html', 0, 0.002274, 0.002682)]
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        if not self_us.strip().isdigit():
+            # The header
+            continue
+        # A space after "|" and two per nesting level
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        modules.append(
+            (name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6)
+        )
+    return modules
+
+
+def run_importtime(statement):
+    """Run the statement with ``-X importtime`` in the interpreter of the benchmarks"""
+    # The checkout the benchmarks run on, e.g. a git worktree
+    path = os.path.dirname(os.path.dirname(os.path.abspath(xlsx2html.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_import(statement, repeat=5, top=10):
+    """
+    The best import time of a few runs. Modules imported by the interpreter
+    on startup are not counted.
+
+    :param top: number of slowest modules by self time to keep
+    """
+    startup = {module for module, *_ in run_importtime("pass")}
+    best = None
+    for _ in range(repeat):
+        modules = run_importtime(statement)
+        seconds = sum(
+            cumulative
+            for module, depth, self_seconds, cumulative in modules
+            if depth == 0 and module not in startup
+        )
+        if best is None or seconds < best[0]:
+            best = (seconds, modules)
+    seconds, modules = best
+    slowest = sorted(
+        (
+            (module, self_seconds)
+            for module, depth, self_seconds, _ in modules
+            if module not in startup
+        ),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "cells": None,
+        "seconds": seconds,
+        "cells_per_second": None,
+        "peak_memory": None,
+        "slowest": slowest[:top],
+    }
@@ -0,0 +1,235 @@
+"""
+Measure each conversion stage on the generated workbooks of :data:`CASES`,
+in full and streaming mode: the best wall time of a few runs, cells per
+second and the peak memory allocated during the stage (``tracemalloc``,
+in a separate run, so it doesn't slow down the timed ones).
+"""
+
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import openpyxl
+
+import xlsx2html
+
+# Only public entry points, so refactoring the internals doesn't break the stages
+from xlsx2html.core import iter_worksheet_cells, render_table, worksheet_to_data
+from xlsx2html.format import format_cell
+
+from .generate import FORMATS, generate_workbook
+from .imports import IMPORTS, measure_import
+
+CASES = {
+    "plain": dict(rows=2000, columns=20),
+    "styled": dict(rows=2000, columns=20, styles=50),
+    "formats": dict(rows=2000, columns=18, formats=tuple(FORMATS)),
+    "merged": dict(rows=2000, columns=20, styles=10, merge_density=0.3),
+    "hyperlinks": dict(rows=2000, columns=20, hyperlink_density=0.05),
+    "images": dict(rows=500, columns=10, images=100),
+}
+MODES = {"full": False, "streaming": True}
+
+
+def get_case_workbook(case, directory, scale=1.0, seed=0):
+    """Generate the workbook of the case once, return its path"""
+    params = dict(CASES[case], seed=seed)
+    params["rows"] = max(int(params["rows"] * scale), 1)
+    name = hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()[:12]
+    path = os.path.join(directory, "%s-%s.xlsx" % (case, name))
+    if not os.path.exists(path):
+        generate_workbook(path, **params)
+    return path, params["rows"] * params["columns"]
+
+
+def load_workbook(path, streaming):
+    # The same as the converter with an explicit mode
+    return openpyxl.load_workbook(path, read_only=streaming, data_only=True)
+
+
+def load_data(path, streaming):
+    wb = load_workbook(path, streaming)
+    data = worksheet_to_data(wb.active, locale="en")
+    data["rows"] = list(data["rows"])
+    return wb, data
+
+
+# Each stage prepares its input and returns (run, cleanup)
+
+
+def stage_load(path, streaming):
+    def run():
+        wb = load_workbook(path, streaming)
+        if streaming:
+            # Read-only mode reads rows lazily
+            for _ in wb.active.iter_rows():
+                pass
+        wb.close()
+
+    return run, None
+
+
+def stage_worksheet_to_data(path, streaming):
+    def run():
+        wb, data = load_data(path, streaming)
+        wb.close()
+
+    return run, None
+
+
+def stage_format_cell(path, streaming):
+    wb = load_workbook(path, streaming)
+    # The cells the converter formats
+    cells = [cell for row in iter_worksheet_cells(wb.active) for cell in row]
+
+    def run():
+        for cell in cells:
+            format_cell(cell, locale="en")
+
+    return run, wb.close
+
+
+def stage_render_table(path, streaming):
+    wb, data = load_data(path, streaming)
+
+    def run():
+        render_table(data)
+
+    return run, wb.close
+
+
+def stage_xlsx2html(path, streaming):
+    def run():
+        xlsx2html.xlsx2html(path, streaming=streaming).close()
+
+    return run, None
+
+
+STAGES = {
+    "load": stage_load,
+    "worksheet_to_data": stage_worksheet_to_data,
+    "format_cell": stage_format_cell,
+    "render_table": stage_render_table,
+    "xlsx2html": stage_xlsx2html,
+}
+
+
+def measure(stage, path, streaming, cells, repeat=3):
+    run, cleanup = stage(path, streaming)
+    try:
+        seconds = min(timeit(run) for _ in range(repeat))
+        tracemalloc.start()
+        try:
+            run()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        if cleanup is not None:
+            cleanup()
+    return {
+        "cells": cells,
+        "seconds": seconds,
+        "cells_per_second": cells / seconds if seconds else None,
+        "peak_memory": peak_memory,
+    }
+
+
+def timeit(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def get_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    cases=None,
+    stages=None,
+    modes=None,
+    scale=1.0,
+    repeat=3,
+    directory=None,
+    seed=0,
+    progress=None,
+    imports=(),
+):
+    """
+    :param cases: names of :data:`CASES`, all by default, ``()`` - none
+    :param stages: names of :data:`STAGES`, all by default
+    :param modes: names of :data:`MODES`, all by default
+    :param imports: names of :data:`benchmarks.imports.IMPORTS` to time
+    :param scale: multiply rows of the cases, e.g. ``0.1`` for a quick run
+    :param directory: where the generated workbooks are kept between runs
+    :param progress: called with each result key and result
+    :return: ``{"meta": {...}, "results": {"case/mode/stage": result}}``
+    """
+    directory = directory or os.path.join(tempfile.gettempdir(), "xlsx2html-bench")
+    os.makedirs(directory, exist_ok=True)
+    results = {}
+    for name in imports:
+        key = "import/%s" % name
+        results[key] = measure_import(IMPORTS[name], repeat=repeat)
+        if progress is not None:
+            progress(key, results[key])
+    for case in CASES if cases is None else cases:
+        path, cells = get_case_workbook(case, directory, scale=scale, seed=seed)
+        for mode in modes or MODES:
+            for stage in stages or STAGES:
+                result = measure(STAGES[stage], path, MODES[mode], cells, repeat=repeat)
+                key = "%s/%s/%s" % (case, mode, stage)
+                results[key] = result
+                if progress is not None:
+                    progress(key, result)
+    return {
+        "meta": {
+            "revision": get_revision(),
+            "xlsx2html": xlsx2html.__version__,
+            "openpyxl": openpyxl.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def format_result(key, result):
+    """
+    >>> format_result("plain/full/load", {
+    ...     "cells": 1000, "seconds": 0.5, "cells_per_second": 2000.0,
+    ...     "peak_memory": 3 * 1024 * 1024})
+    'plain/full/load                             0.500s       2000 cells/s      3.0 MiB'
+    >>> format_result("import/package", {"seconds": 0.25, "cells_per_second": None})
+    'import/package                              0.250s'
+    """
+    if result["cells_per_second"] is None:
+        return "%-40s %8.3fs" % (key, result["seconds"])
+    return "%-40s %8.3fs %10.0f cells/s %8.1f MiB" % (
+        key,
+        result["seconds"],
+        result["cells_per_second"] or 0,
+        result["peak_memory"] / 1024 / 1024,
+    )
+
+
+def save_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
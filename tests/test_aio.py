@@ -0,0 +1,83 @@
+import asyncio
+
+from tests.test_files import get_fixture
+from xlsx2html import aio, xlsx2html
+
+XLSX_FILE = get_fixture("example.xlsx")
+
+
+def test_aiter_xlsx2html():
+    async def convert():
+        return [
+            chunk
+            async for chunk in aio.aiter_xlsx2html(
+                XLSX_FILE, sheet=-1, streaming=True, chunk_size=1024
+            )
+        ]
+
+    chunks = asyncio.run(convert())
+    assert len(chunks) > 1
+    assert "".join(chunks) == xlsx2html(XLSX_FILE, sheet=-1).getvalue()
+
+    html = asyncio.run(aio.axlsx2html(XLSX_FILE, locale="ru"))
+    assert html == xlsx2html(XLSX_FILE, locale="ru").getvalue()
+
+
+def test_cancel(monkeypatch):
+    rows = []
+    closed = []
+    iter_xlsx2html = aio.iter_xlsx2html
+
+    def counted_iter_xlsx2html(*args, **kwargs):
+        try:
+            for chunk in iter_xlsx2html(*args, **kwargs):
+                rows.append(chunk)
+                yield chunk
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(aio, "iter_xlsx2html", counted_iter_xlsx2html)
+
+    async def convert():
+        async for chunk in aio.aiter_xlsx2html(XLSX_FILE, chunk_size=1):
+            await asyncio.sleep(1)
+
+    async def cancel():
+        task = asyncio.ensure_future(convert())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+
+    assert asyncio.run(cancel())
+    # Only the header was rendered, then the conversion was closed
+    assert len(rows) == 1
+    assert closed == [True]
+
+
+def test_semaphore(monkeypatch):
+    running = []
+    max_running = []
+    iter_xlsx2html = aio.iter_xlsx2html
+
+    def counted_iter_xlsx2html(*args, **kwargs):
+        running.append(1)
+        max_running.append(len(running))
+        try:
+            yield from iter_xlsx2html(*args, **kwargs)
+        finally:
+            running.pop()
+
+    monkeypatch.setattr(aio, "iter_xlsx2html", counted_iter_xlsx2html)
+
+    async def convert_all():
+        semaphore = asyncio.Semaphore(2)
+        return await asyncio.gather(
+            *[aio.axlsx2html(XLSX_FILE, semaphore=semaphore) for _ in range(5)]
+        )
+
+    results = asyncio.run(convert_all())
+    assert len(set(results)) == 1
+    assert max(max_running) == 2
@@ -0,0 +1,56 @@
+import io
+import os
+import shutil
+
+import pytest
+
+from tests.test_files import get_fixture
+from xlsx2html import batch
+
+
+@pytest.fixture()
+def input_dir(tmp_path):
+    for name in ["example.xlsx", "hyperlinks.xlsx"]:
+        shutil.copy(get_fixture(name), tmp_path / name)
+    (tmp_path / "broken.xlsx").write_bytes(b"not a zip")
+    (tmp_path / "~$example.xlsx").write_bytes(b"lock file")
+    (tmp_path / "notes.txt").write_text("skip me")
+    return tmp_path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_directory(input_dir, capsys, jobs):
+    args = [str(input_dir), "--jobs", str(jobs), "--sheet", "-1"]
+    assert batch.main(args) == 1
+    out, err = capsys.readouterr()
+    assert "Converted 2 files" in out
+    assert "skipped 0 up to date, 1 failed" in out
+    assert "FAILED %s" % (input_dir / "broken.xlsx") in err
+    html = (input_dir / "example.html").read_text()
+    assert html.count("</table>") == 3
+    assert not (input_dir / "broken.html").exists()
+    assert not (input_dir / "broken.html.tmp").exists()
+
+    # Outputs are newer than inputs
+    assert batch.main(args) == 1
+    out, err = capsys.readouterr()
+    assert "Converted 0 files" in out
+    assert "skipped 2 up to date, 1 failed" in out
+
+    os.utime(input_dir / "example.xlsx")
+    batch.main([str(input_dir / "*.xlsx"), "--jobs", str(jobs)])
+    assert "Converted 1 files" in capsys.readouterr().out
+
+
+def test_convert_manifest(input_dir, tmp_path, monkeypatch, capsys):
+    output_dir = tmp_path / "out"
+    manifest = "%s\n\n%s\t%s\n" % (
+        input_dir / "example.xlsx",
+        input_dir / "hyperlinks.xlsx",
+        tmp_path / "links.html",
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO(manifest))
+    assert batch.main(["--output-dir", str(output_dir)]) == 0
+    assert "Converted 2 files" in capsys.readouterr().out
+    assert (output_dir / "example.html").exists()
+    assert (tmp_path / "links.html").exists()
@@ -0,0 +1,92 @@
+import openpyxl
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_results, format_comparison, load_results
+from benchmarks.generate import FORMATS, generate_workbook
+from benchmarks.imports import IMPORTS, measure_import, run_importtime
+from benchmarks.run import run_benchmarks
+
+
+def read_values(path):
+    wb = openpyxl.load_workbook(path)
+    ws = wb.active
+    return (
+        [[cell.value for cell in row] for row in ws.iter_rows()],
+        sorted(str(merged) for merged in ws.merged_cells.ranges),
+        len(ws._images),
+    )
+
+
+def test_generate_workbook(tmp_path):
+    options = dict(
+        rows=30,
+        columns=len(FORMATS),
+        styles=5,
+        merge_density=0.3,
+        formats=tuple(FORMATS),
+        hyperlink_density=0.1,
+        images=6,
+    )
+    first = read_values(generate_workbook(str(tmp_path / "1.xlsx"), **options))
+    second = read_values(generate_workbook(str(tmp_path / "2.xlsx"), **options))
+    assert first == second
+    assert len(first[0]) == 30
+    assert first[1]
+    assert first[2] == 6
+
+    other = generate_workbook(str(tmp_path / "3.xlsx"), seed=1, **options)
+    assert read_values(other) != first
+
+
+def test_run_and_compare(tmp_path, capsys):
+    results = run_benchmarks(
+        cases=["merged"], scale=0.01, repeat=1, directory=str(tmp_path)
+    )
+    assert len(results["results"]) == 10
+    result = results["results"]["merged/streaming/xlsx2html"]
+    assert result["cells"] == 20 * 20
+    assert result["cells_per_second"] > 0
+    assert result["peak_memory"] > 0
+
+    base = str(tmp_path / "base.json")
+    new = str(tmp_path / "new.json")
+    args = ["run", "--case", "plain", "--stage", "render_table", "--scale", "0.01"]
+    assert main(args + ["--dir", str(tmp_path), "-o", base, "--repeat", "1"]) == 0
+    assert main(args + ["--dir", str(tmp_path), "-o", new, "--repeat", "1"]) == 0
+    rows = compare_results(load_results(base), load_results(new))
+    assert [row[0] for row in rows] == [
+        "plain/full/render_table",
+        "plain/streaming/render_table",
+    ]
+    assert main(["compare", base, new, "--threshold", "100"]) == 0
+    assert "plain/full/render_table" in capsys.readouterr().out
+
+
+def test_import_time():
+    modules = {module for module, *_ in run_importtime(IMPORTS["package"])}
+    assert "xlsx2html" in modules
+    assert not {"openpyxl", "babel", "xlsx2html.core"} & modules
+
+    modules = {module for module, *_ in run_importtime(IMPORTS["core"])}
+    assert "xlsx2html.core" in modules
+    # Loaded on first use
+    lazy = {
+        "babel",
+        "packaging",
+        "six",
+        "concurrent.futures.process",
+        "xlsx2html.constants.locale_format",
+    }
+    assert not lazy & modules
+
+    result = measure_import(IMPORTS["package"], repeat=1, top=3)
+    assert result["seconds"] > 0
+    assert len(result["slowest"]) <= 3
+
+
+def test_compare_zero_base_time():
+    base = {"results": {"import/package": {"seconds": 0.0}}}
+    new = {"results": {"import/package": {"seconds": 0.002}}}
+    rows = compare_results(base, new)
+    assert rows == [("import/package", 0.0, 0.002, None, "")]
+    assert format_comparison(rows).endswith(" +0.002s ")
@@ -0,0 +1,124 @@
+import os
+
+import openpyxl
+import pytest
+
+from tests.test_files import get_fixture
+from xlsx2html import core, xlsx2html
+from xlsx2html.cache import ConversionCache
+
+
+def save_workbook(path, first="a", second="b"):
+    wb = openpyxl.Workbook()
+    wb.active.append([first, 1])
+    wb.create_sheet("Second").append([second, 2])
+    wb.save(path)
+
+
+@pytest.fixture()
+def rendered_sheets(monkeypatch):
+    rendered = []
+    render_sheet_table = core.render_sheet_table
+
+    def counted_render_sheet_table(ws, *args, **kwargs):
+        rendered.append(ws.title)
+        return render_sheet_table(ws, *args, **kwargs)
+
+    monkeypatch.setattr(core, "render_sheet_table", counted_render_sheet_table)
+    return rendered
+
+
+@pytest.mark.parametrize("css_classes", [False, True])
+def test_document_cache(tmp_path, rendered_sheets, css_classes):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    path = get_fixture("example.xlsx")
+    expected = xlsx2html(path, sheet=-1, workers=2, css_classes=css_classes).getvalue()
+
+    html = xlsx2html(path, sheet=-1, css_classes=css_classes, cache=cache).getvalue()
+    assert html == expected
+    assert len(rendered_sheets) == 3
+    assert (cache.hits, cache.misses) == (0, 4)
+
+    html = xlsx2html(path, sheet=-1, css_classes=css_classes, cache=cache).getvalue()
+    assert html == expected
+    assert len(rendered_sheets) == 3
+    assert (cache.hits, cache.misses) == (4, 4)
+
+    # Other options are other entries
+    xlsx2html(path, sheet=-1, locale="ru", css_classes=css_classes, cache=cache)
+    assert len(rendered_sheets) == 6
+
+
+def test_sheet_reuse(tmp_path, rendered_sheets):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    path = str(tmp_path / "book.xlsx")
+    save_workbook(path)
+    xlsx2html(path, sheet=-1, cache=cache)
+    assert rendered_sheets == ["Sheet", "Second"]
+
+    save_workbook(path, second="changed")
+    html = xlsx2html(path, sheet=-1, cache=cache).getvalue()
+    assert rendered_sheets == ["Sheet", "Second", "Second"]
+    assert ">changed</td>" in html
+    assert html == xlsx2html(path, sheet=-1, workers=2).getvalue()
+
+
+def test_eviction(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), max_size=120)
+    cache.set("old", {"table": "x" * 40})
+    os.utime(cache._path("old"), (0, 0))
+    cache.set("used", {"table": "y" * 40})
+    os.utime(cache._path("used"), (1, 1))
+    assert cache.get("used") is not None
+    cache.set("new", {"table": "z" * 40})
+
+    assert cache.get("old") is None
+    assert cache.get("used") == {"table": "y" * 40}
+    info = cache.info()
+    assert info["entries"] == 2
+    assert info["size"] <= 120
+    assert (info["hits"], info["misses"]) == (2, 1)
+
+    cache.clear()
+    assert cache.info()["entries"] == 0
+
+
+def test_function_options(tmp_path, rendered_sheets):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    path = str(tmp_path / "book.xlsx")
+    save_workbook(path)
+
+    def caption(text):
+        return lambda data, html: html.append("<caption>%s</caption>" % text)
+
+    # Same name and scope, other closures
+    for text in ["first", "second", "first"]:
+        html = xlsx2html(path, cache=cache, append_headers=caption(text)).getvalue()
+        assert "<caption>%s</caption>" % text in html
+    assert len(rendered_sheets) == 2
+    entries = cache.info()["entries"]
+
+    # Closure over an object without a stable identity, not cached
+    marker = object()
+    html = xlsx2html(path, cache=cache, append_headers=lambda data, html: marker)
+    assert "<table" in html.getvalue()
+    assert cache.info()["entries"] == entries
+
+
+def test_shared_images(tmp_path, fixture_file):
+    from openpyxl.drawing.image import Image
+
+    cache = ConversionCache(str(tmp_path / "cache"))
+    path = str(tmp_path / "book.xlsx")
+    wb = openpyxl.Workbook()
+    for ws in (wb.active, wb.create_sheet("Second")):
+        ws.append([1, 2])
+        ws.add_image(Image(fixture_file("img.png")), "B2")
+    wb.save(path)
+
+    expected = xlsx2html(path, sheet=-1, images="shared").getvalue()
+    assert expected.count(";base64,") == 1
+    for _ in range(2):
+        html = xlsx2html(path, sheet=-1, images="shared", cache=cache).getvalue()
+        assert html == expected
+    assert cache.hits == 3
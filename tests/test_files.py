@@ -8,7 +8,7 @@ import pytest
 from PIL import Image
 
 from tests.conftest import IN_GITHUB_ACTIONS
-from xlsx2html.core import worksheet_to_data, xlsx2html
+from xlsx2html.core import iter_xlsx2html, render_table, worksheet_to_data, xlsx2html
 
 FIXTURES_ROOT = os.path.join(os.path.dirname(__file__), "fixtures")
 
@@ -46,6 +46,19 @@ def test_default_output():
     assert result_html
 
 
+def test_iter_xlsx2html():
+    out_file = xlsx2html(XLSX_FILE, locale="en", sheet=-1)
+    out_file.seek(0)
+    chunks = list(iter_xlsx2html(XLSX_FILE, locale="en", sheet=-1))
+    # header, table start, rows, table end, ..., footer
+    assert len(chunks) > 30
+    assert chunks[-1].strip().endswith("</html>")
+    assert "".join(chunks) == out_file.read()
+
+    byte_chunks = iter_xlsx2html(XLSX_FILE, locale="en", sheet=-1, encoding="utf-8")
+    assert b"".join(byte_chunks) == "".join(chunks).encode("utf-8")
+
+
 def test_hyperlink(temp_file):
     out_file = temp_file()
     xlsx2html(get_fixture("hyperlinks.xlsx"), out_file, locale="en", parse_formula=True)
@@ -53,6 +66,94 @@ def test_hyperlink(temp_file):
     assert result_html
 
 
+class NonSeekableStream(io.RawIOBase):
+    def __init__(self, path):
+        self._fp = open(path, "rb")
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._fp.readinto(b)
+
+    def close(self):
+        self._fp.close()
+        super().close()
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parse_formula_loads_workbook_once(streaming, monkeypatch):
+    loads = []
+    original_load_workbook = openpyxl.load_workbook
+
+    def load_workbook(*args, **kwargs):
+        loads.append(kwargs)
+        return original_load_workbook(*args, **kwargs)
+
+    monkeypatch.setattr(openpyxl, "load_workbook", load_workbook)
+    expected = xlsx2html(
+        get_fixture("hyperlinks.xlsx"), sheet=-1, parse_formula=True, streaming=False
+    )
+    expected.seek(0)
+    loads.clear()
+
+    with NonSeekableStream(get_fixture("hyperlinks.xlsx")) as stream:
+        result = xlsx2html(stream, sheet=-1, parse_formula=True, streaming=streaming)
+    result.seek(0)
+    assert len(loads) == 1
+    assert loads[0]["data_only"]
+    result_html = result.read()
+    assert result_html == expected.read()
+    assert '<a href="https://example.com">ho ho example text</a>' in result_html
+
+
+def test_sheet_formulas():
+    from xlsx2html.reader import WorkbookFormulas
+
+    formulas = WorkbookFormulas(get_fixture("hyperlinks.xlsx"))
+    sheet_formulas = formulas.get_sheet_formulas("Sheet1")
+    formulas.close()
+    f_cell = sheet_formulas[(5, 2)]
+    assert f_cell.data_type == "f"
+    assert f_cell.value == '=HYPERLINK("https://example.com", "ho ho example text")'
+    # Only formula cells
+    assert (5, 1) not in sheet_formulas
+
+
+def test_hyperlink_formula_caches(monkeypatch):
+    from xlsx2html.format import cache_clear, cache_info
+    from xlsx2html.format import hyperlink
+
+    resolved = []
+    resolve_cell = hyperlink.resolve_cell
+
+    def counted_resolve_cell(worksheet, coord):
+        resolved.append(coord)
+        return resolve_cell(worksheet, coord)
+
+    monkeypatch.setattr(hyperlink, "resolve_cell", counted_resolve_cell)
+    cache_clear()
+    for streaming in [True, True, False]:
+        result = xlsx2html(
+            get_fixture("hyperlinks.xlsx"), parse_formula=True, streaming=streaming
+        )
+        assert '<a href="https://ya.ru">' in result.getvalue()
+    assert resolved == ["C6", "C7", "Sheet2!B2"] * 3
+    # Formulas are tokenized once
+    info = cache_info()["hyperlink_formula"]
+    assert (info.misses, info.hits) == (6, 12)
+
+    # Cells of a read-only workbook are looked up once
+    resolved.clear()
+    wb = openpyxl.load_workbook(get_fixture("hyperlinks.xlsx"), read_only=True)
+    ws = wb["Sheet1"]
+    for _ in range(3):
+        assert hyperlink.resolve_cell_value(ws, "Sheet2!B2") == "https://ya.ru"
+        assert hyperlink.resolve_cell_value(ws, "A1") is None
+    wb.close()
+    assert resolved == ["Sheet2!B2", "A1"]
+
+
 def test_issue_30_cell_range_value(temp_file):
     out_file = temp_file()
     xlsx2html(
@@ -154,6 +255,45 @@ def test_multiple_sheets(temp_file):
     assert result_html.count("</table>") == 3
 
 
+@pytest.mark.parametrize(
+    "sheet,css_classes", [(-1, False), ([2, "Лист 1"], False), (-1, True)]
+)
+def test_parallel_sheets(sheet, css_classes):
+    expected = xlsx2html(
+        XLSX_FILE, sheet=sheet, css_classes=css_classes, streaming=True
+    ).getvalue()
+    assert expected.count("</table>") >= 2
+    result_html = xlsx2html(
+        XLSX_FILE, sheet=sheet, css_classes=css_classes, workers=2
+    ).getvalue()
+    assert result_html == expected
+
+    with open(XLSX_FILE, "rb") as f:
+        result_html = xlsx2html(
+            f, sheet=sheet, css_classes=css_classes, workers=2
+        ).getvalue()
+    assert result_html == expected
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_css_classes(streaming):
+    inline_html = xlsx2html(XLSX_FILE, sheet=-1, streaming=streaming).getvalue()
+    result_html = xlsx2html(
+        XLSX_FILE, sheet=-1, css_classes=True, streaming=streaming
+    ).getvalue()
+    assert len(result_html) < len(inline_html) / 2
+    assert result_html.count("<style>") == 1
+    head, body = result_html.split("<body>")
+    assert ("<style>" in head) != streaming
+    assert '<td class="x2h-s0" id="Лист 1!A1">&nbsp;</td>' in result_html
+    assert "<td id=" not in result_html
+    assert (
+        ".x2h-s0 {border-bottom: none;border-collapse: collapse;border-left: none;"
+        "border-right: none;border-top: none;color: #000000;font-size: 11.0px;"
+        "height: 14.45pt}"
+    ) in result_html
+
+
 def test_issue_58(temp_file):
     """
     Test html escape in text
@@ -169,3 +309,171 @@ def test_issue_58(temp_file):
     # Must be escaped
     assert data_cell["value"] == "<script>alert(1)</script>"
     assert data_cell["formatted_value"] == "&lt;script&gt;alert(1)&lt;/script&gt;"
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_hidden_rows_and_columns(temp_file, monkeypatch, streaming):
+    from xlsx2html import core
+
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(1, 6):
+        ws.append(["a%s" % i, "b%s" % i, "c%s" % i, "d%s" % i])
+    ws.column_dimensions.group("B", "C", hidden=True)
+    ws.row_dimensions[2].hidden = True
+    ws.row_dimensions[3].height = 30
+    wb.save(path)
+
+    formatted = []
+    format_value = core.format_value
+
+    def counted_format_value(cell, *args, **kwargs):
+        formatted.append(cell.coordinate)
+        return format_value(cell, *args, **kwargs)
+
+    monkeypatch.setattr(core, "format_value", counted_format_value)
+    result_html = xlsx2html(path, streaming=streaming).getvalue()
+    assert formatted == ["A1", "D1", "A3", "D3", "A4", "D4", "A5", "D5"]
+    assert "b1" not in result_html
+    assert "a2" not in result_html
+    assert "<col " not in result_html
+    assert "height: 30.0pt" in result_html
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_trim_empty(temp_file, streaming):
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(1, 4):
+        ws.append(["a%s" % i, "b%s" % i, "c%s" % i])
+    ws["E10"].fill = openpyxl.styles.PatternFill("solid", fgColor="FF0000")
+    # Phantom cells: no value and nothing visible
+    ws["Z500"].font = openpyxl.styles.Font(b=True)
+    for row in range(600, 700):
+        ws.row_dimensions[row].height = 30
+    wb.save(path)
+
+    result_html = xlsx2html(path, streaming=streaming).getvalue()
+    assert result_html.count("<tr>") == 10
+    assert result_html.count("<td ") == 50
+    assert "background-color: #FF0000" in result_html
+
+    result_html = xlsx2html(path, streaming=streaming, trim_empty=False).getvalue()
+    assert result_html.count("<tr>") == 500
+    assert 'id="Sheet!Z500"' in result_html
+
+    result_html = xlsx2html(
+        path, streaming=streaming, max_rows=2, max_columns=1
+    ).getvalue()
+    assert result_html.count("<td ") == 2
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_range(temp_file, monkeypatch, streaming):
+    from xlsx2html import core, xlsx2html_range
+
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(1, 21):
+        ws.append(["%s%s" % (c, i) for c in "abcdef"])
+    ws.merge_cells("B4:C7")
+    ws.column_dimensions["A"].width = 40
+    ws.column_dimensions["C"].width = 30
+    wb.save(path)
+
+    formatted = []
+    format_value = core.format_value
+
+    def counted_format_value(cell, *args, **kwargs):
+        formatted.append(cell.coordinate)
+        return format_value(cell, *args, **kwargs)
+
+    monkeypatch.setattr(core, "format_value", counted_format_value)
+    page = xlsx2html_range(path, "B:D", offset=5, limit=3, streaming=streaming)
+    assert page["min_row"] == 6
+    assert page["max_row"] == 8
+    assert (page["min_column"], page["max_column"]) == (2, 4)
+    assert (page["total_rows"], page["total_columns"]) == (20, 6)
+    # The merged range is cut to the window, its value comes from B4
+    assert formatted == ["B4", "D6", "D7", "B8", "C8", "D8"]
+    assert page["html"].count("<tr>") == 3
+    assert page["html"].count("<col ") == 1
+    assert "width: 288.0px" in page["html"]
+    assert '<td colspan="2" id="Sheet!B6" rowspan="2"' in page["html"]
+    assert ">b4</td>" in page["html"]
+    assert "a6" not in page["html"]
+    assert "e6" not in page["html"]
+
+    page = xlsx2html_range(path, "E18:Z30", streaming=streaming)
+    assert (page["min_row"], page["max_row"]) == (18, 20)
+    assert (page["min_column"], page["max_column"]) == (5, 6)
+    assert page["html"].count("<td ") == 6
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_empty_range(temp_file, streaming):
+    from xlsx2html import xlsx2html_range
+
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(1, 6):
+        ws.append(["%s%s" % (c, i) for c in "ab"])
+    wb.save(path)
+
+    for kwargs, bounds in [
+        (dict(limit=0), (1, 0, 1, 2)),
+        (dict(offset=100), (101, 100, 1, 2)),
+        (dict(cell_range="zz"), (1, 5, 702, 701)),
+    ]:
+        page = xlsx2html_range(path, streaming=streaming, **kwargs)
+        assert "<tr>" not in page["html"]
+        assert page["html"].endswith("</table>")
+        assert bounds == (
+            page["min_row"],
+            page["max_row"],
+            page["min_column"],
+            page["max_column"],
+        )
+
+    for kwargs in [
+        dict(cell_range="C1:A1"),
+        dict(cell_range="A0"),
+        dict(cell_range="not a range"),
+        dict(offset=-1),
+        dict(limit=-1),
+    ]:
+        with pytest.raises(ValueError):
+            xlsx2html_range(path, streaming=streaming, **kwargs)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_max_rows_and_columns_zero(streaming):
+    for kwargs in [dict(max_rows=0), dict(max_columns=0)]:
+        result_html = xlsx2html(XLSX_FILE, streaming=streaming, **kwargs).getvalue()
+        assert "<tr>" not in result_html
+        assert "</table>" in result_html
+
+    for kwargs in [dict(max_rows=-1), dict(max_columns=-1)]:
+        with pytest.raises(ValueError):
+            xlsx2html(XLSX_FILE, streaming=streaming, **kwargs)
+
+
+def test_render_table_dict_rows():
+    wb = openpyxl.load_workbook(XLSX_FILE, data_only=True)
+    data = worksheet_to_data(wb.worksheets[0])
+    rows = [list(row) for row in data["rows"]]
+    expected = render_table(dict(data, rows=rows))
+
+    dict_rows = [[dict(cell) for cell in row] for row in rows]
+    assert render_table(dict(data, rows=dict_rows)) == expected
+
+    # Cells can be changed the way the dicts were
+    cell = rows[0][0]
+    cell["formatted_value"] = "changed"
+    assert "changed</td>" in render_table(dict(data, rows=rows))
+    with pytest.raises(TypeError):
+        cell["attrs"] = {}
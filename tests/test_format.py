@@ -160,3 +160,75 @@ timedelta_arge = [
 @pytest.mark.parametrize("args,expected", timedelta_arge)
 def test_format_timedelta(args, expected):
     assert format_timedelta(*args) == expected
+
+
+def test_number_format_cache():
+    from xlsx2html.format import cache_clear, cache_info
+
+    cache_clear()
+    for i in range(100):
+        format_decimal(i, "#,##0.00", "en")
+    format_decimal(1, "#,##0.00", "ru")
+    info = cache_info()
+    assert info["number_pattern"].misses == 1
+    assert info["number_pattern"].hits == 100
+    assert info["locale"].misses == 2
+    assert format_decimal(1500, "#,##0.00", "ru") == "1\xa0500,00"
+
+    cache_clear()
+    assert cache_info()["number_pattern"].currsize == 0
+
+
+def test_datetime_format_cache():
+    from xlsx2html.format import cache_clear, cache_info
+
+    cache_clear()
+    for i in range(1, 29):
+        assert format_date(datetime.date(2019, 12, i), "DD/MM/YY", "ru") == (
+            "%02d/12/19" % i
+        )
+    assert format_time(dt.time(), "HH:MM:SS", "ru") == "06:09:05"
+    assert format_datetime(dt, "HH:MM:SS", "ru") == "06:09:05"
+    info = cache_info()["datetime"]
+    # date, time with fixed day and datetime
+    assert info.misses == 3
+    assert info.hits == 27
+
+
+def test_timedelta_formatter():
+    from xlsx2html.format.dt import get_timedelta_formatter
+
+    formatter = get_timedelta_formatter("[hhh] - mm - ss.000 x")
+    assert formatter is get_timedelta_formatter("[hhh] - mm - ss.000 x")
+    assert formatter.format_many([td, td2]) == [
+        format_timedelta(td, "[hhh] - mm - ss.000 x"),
+        format_timedelta(td2, "[hhh] - mm - ss.000 x"),
+    ]
+    assert formatter.ops[-1] == (None, " x")
+    with pytest.raises(ValueError):
+        get_timedelta_formatter("[h]:dd")
+
+
+def test_format_cell_fast_path(monkeypatch):
+    from openpyxl import Workbook
+
+    from xlsx2html import format as xlsx_format
+
+    ws = Workbook().active
+    values = ["a_x000a_<b>", "", None, 0, 15, 1.5, -0.0, True, False]
+    cells = [ws.cell(1, col, value) for col, value in enumerate(values, 1)]
+    # Text format
+    for col, value in enumerate(["text", "", None], 1):
+        cell = ws.cell(2, col, value)
+        cell.number_format = "@"
+        cells.append(cell)
+    cells[-1].hyperlink = "https://example.com"
+    link = ws.cell(3, 1, "link")
+    link.hyperlink = "#Sheet!A1"
+    cells.append(link)
+
+    fast = [xlsx_format.format_cell(cell) for cell in cells]
+    monkeypatch.setattr(xlsx_format, "FAST_FORMATTERS", {})
+    assert fast == [xlsx_format.format_cell(cell) for cell in cells]
+    assert fast[:3] == ["a\n&lt;b&gt;", "&nbsp;", "&nbsp;"]
+    assert fast[-1] == '<a href="#Sheet.A1">link</a>'
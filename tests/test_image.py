@@ -1,7 +1,10 @@
+import io
+import os
+
 import pytest
 
 from xlsx2html import xlsx2html
-from xlsx2html.utils.image import bytes_to_datauri
+from xlsx2html.utils.image import bytes_to_datauri, iter_datauri
 
 
 def test_to_datauri(fixture_file):
@@ -27,3 +30,132 @@ def test_image(temp_file, browser, screenshot_regression, fixture_file):
     browser.visit("file://" + out_file)
     print('Window size', browser.driver.get_window_size())
     screenshot_regression()
+
+
+def test_iter_datauri(fixture_file):
+    path = fixture_file("img.png")
+    with open(path, "rb") as fp:
+        chunks = list(iter_datauri(fp, path, chunk_size=30))
+        assert len(chunks) > 3
+        assert "".join(chunks) == bytes_to_datauri(fp, path)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_shared_images(fixture_file, streaming):
+    # The same image 4 times
+    path = fixture_file("image.xlsx")
+    inline_html = xlsx2html(path, streaming=streaming).getvalue()
+    assert inline_html.count(";base64,") == 4
+
+    result_html = xlsx2html(path, images="shared", streaming=streaming).getvalue()
+    assert result_html.count(";base64,") == 1
+    assert result_html.count('<span class="x2h-img-') == 4
+    assert "background-size: 100% 100%" in result_html
+
+
+def test_assets_images(fixture_file, tmp_path):
+    output = tmp_path / "out" / "report.html"
+    output.parent.mkdir()
+    assets_dir = tmp_path / "static"
+    xlsx2html(
+        fixture_file("image.xlsx"),
+        str(output),
+        images="assets",
+        assets_dir=str(assets_dir),
+    ).close()
+    result_html = output.read_text()
+    assert ";base64," not in result_html
+    (asset,) = os.listdir(assets_dir)
+    assert asset.endswith(".png")
+    assert result_html.count('src="../static/%s" loading="lazy"' % asset) == 4
+
+    result_html = xlsx2html(
+        fixture_file("image.xlsx"),
+        io.StringIO(),
+        images="assets",
+        assets_dir=str(assets_dir),
+    ).getvalue()
+    assert result_html.count('src="static/%s"' % asset) == 4
+
+
+def test_streaming_images_not_decoded(fixture_file, monkeypatch):
+    path = fixture_file("image.xlsx")
+    expected = xlsx2html(path, streaming=False).getvalue()
+
+    def pil_open(*args, **kwargs):
+        raise AssertionError("Images must not be decoded")
+
+    monkeypatch.setattr("PIL.Image.open", pil_open)
+    assert xlsx2html(path, streaming=True).getvalue() == expected
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_skip_images(fixture_file, streaming):
+    result_html = xlsx2html(
+        fixture_file("image.xlsx"), images="none", streaming=streaming
+    ).getvalue()
+    assert "<img" not in result_html
+    assert "<table" in result_html
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_image_size_from_anchor(fixture_file, temp_file, streaming):
+    # openpyxl saves images without <a:xfrm>, the size is in the anchor
+    import openpyxl
+    from openpyxl.drawing.image import Image
+
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for i in range(3):
+        ws.append([1, 2, 3])
+    ws.add_image(Image(fixture_file("img.png")), "B2")
+    wb.save(path)
+
+    result_html = xlsx2html(path, streaming=streaming).getvalue()
+    assert '<img width="23" height="23"' in result_html
+
+
+@pytest.mark.parametrize("source", ["path", "stream"])
+def test_shared_images_parallel_sheets(fixture_file, temp_file, source):
+    import openpyxl
+    from openpyxl.drawing.image import Image
+
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    for ws in (wb.active, wb.create_sheet("Second"), wb.create_sheet("Third")):
+        ws.append([1, 2, 3])
+        ws.add_image(Image(fixture_file("img.png")), "B2")
+    wb.save(path)
+
+    expected = xlsx2html(path, sheet=-1, images="shared", streaming=True).getvalue()
+    assert expected.count(";base64,") == 1
+    if source == "stream":
+        with open(path, "rb") as f:
+            result_html = xlsx2html(f, sheet=-1, images="shared", workers=2).getvalue()
+    else:
+        result_html = xlsx2html(path, sheet=-1, images="shared", workers=2).getvalue()
+    assert result_html == expected
+
+
+def test_zip_image_ref_closes_archive_file(fixture_file):
+    import openpyxl
+
+    from xlsx2html.reader import SheetLayout
+
+    wb = openpyxl.load_workbook(fixture_file("image.xlsx"), read_only=True)
+    layout = SheetLayout(wb.active)
+    archive = wb._archive
+    opened = []
+    original_open = archive.open
+
+    def archive_open(*args, **kwargs):
+        fp = original_open(*args, **kwargs)
+        opened.append(fp)
+        return fp
+
+    archive.open = archive_open
+    data = layout.images[0].ref.read()
+    assert data.startswith(b"\x89PNG")
+    assert opened and all(fp.closed for fp in opened)
+    wb.close()
@@ -0,0 +1,163 @@
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import xlsx2html
+from tests.test_files import get_fixture
+from xlsx2html import server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def request(connection, method, url, body=None):
+    connection.request(method, url, body)
+    response = connection.getresponse()
+    return response, response.read()
+
+
+@pytest.fixture(scope="module")
+def http_server():
+    conversion_server = server.make_server(("127.0.0.1", 0))
+    thread = threading.Thread(target=conversion_server.serve_forever)
+    thread.start()
+    yield conversion_server
+    conversion_server.shutdown()
+    conversion_server.server_close()
+    thread.join()
+
+
+@pytest.fixture()
+def connection(http_server):
+    connection = http.client.HTTPConnection(*http_server.server_address)
+    yield connection
+    connection.close()
+
+
+def test_parse_options():
+    assert server.parse_options("sheet=-1&streaming=auto", {"locale": "de"}) == {
+        "locale": "de",
+        "sheet": -1,
+        "streaming": None,
+    }
+    for query in [
+        "output=x.html",
+        "css_classes=maybe",
+        "images=assets",
+        "locale=xx",
+        "max_rows=-1",
+        "max_columns=-5",
+        "default_cell_border=1px%20solid%20red;color:red",
+        "default_cell_border=%22%3E%3Cscript%3E",
+        "default_cell_border=",
+    ]:
+        with pytest.raises(ValueError):
+            server.parse_options(query)
+    assert server.parse_options("default_cell_border=thin+dashed+%23ccc") == {
+        "default_cell_border": "thin dashed #ccc"
+    }
+
+
+def test_convert(connection):
+    with open(get_fixture("example.xlsx"), "rb") as f:
+        workbook = f.read()
+    response, body = request(connection, "POST", "/?sheet=-1&locale=ru", workbook)
+    assert response.status == 200
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    expected = xlsx2html.xlsx2html(get_fixture("example.xlsx"), locale="ru", sheet=-1)
+    assert body.decode("utf-8") == expected.getvalue()
+
+    # The connection is kept alive
+    response, body = request(connection, "GET", "/status")
+    status = json.loads(body)
+    assert status["pid"] == os.getpid()
+    assert status["conversions"] >= 1
+    assert status["caches"]["locale"]["hits"] > 0
+
+
+def test_errors(http_server, connection, monkeypatch):
+    response, body = request(connection, "POST", "/", b"not a zip")
+    assert response.status == 400
+    assert b"BadZipFile" in body
+
+    connection.close()
+    response, body = request(connection, "POST", "/?images=assets", b"")
+    assert response.status == 400
+
+    connection.close()
+    with open(get_fixture("example.xlsx"), "rb") as f:
+        workbook = f.read()
+    response, body = request(
+        connection, "POST", "/?default_cell_border=red%22%3E", workbook
+    )
+    assert response.status == 400
+    assert b"invalid default_cell_border" in body
+
+    connection.close()
+    monkeypatch.setattr(http_server, "max_size", 1024)
+    response, body = request(connection, "POST", "/", b"x" * 1025)
+    assert response.status == 413
+
+    connection.close()
+    response, body = request(connection, "GET", "/")
+    assert response.status == 404
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # "foo\r\nX-Injected: yes"
+        "foo%0d%0aX-Injected:%20yes=1",
+        # "лист"
+        "%D0%BB%D0%B8%D1%81%D1%82=1",
+    ],
+)
+def test_error_status_line(connection, query):
+    response, body = request(connection, "POST", "/?" + query, b"")
+    assert response.status == 400
+    assert response.reason == "Bad Request"
+    assert response.getheader("X-Injected") is None
+    assert b"unknown option" in body
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="no os.fork")
+def test_prefork_workers(tmp_path):
+    socket_path = str(tmp_path / "xlsx2html.sock")
+    args = ["serve", "--unix-socket", socket_path, "--workers", "2"]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "xlsx2html", *args],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(xlsx2html.__file__))),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stdout.readline().strip() == "Serving on %s" % socket_path
+        with open(get_fixture("hyperlinks.xlsx"), "rb") as f:
+            workbook = f.read()
+        pids = set()
+        for _ in range(4):
+            connection = UnixHTTPConnection(socket_path)
+            response, body = request(connection, "POST", "/", workbook)
+            assert response.status == 200
+            assert b"</html>" in body
+            response, body = request(connection, "GET", "/status")
+            pids.add(json.loads(body)["pid"])
+            connection.close()
+        assert process.pid not in pids
+    finally:
+        process.terminate()
+        assert process.wait(timeout=10) == 0
+    assert not os.path.exists(socket_path)
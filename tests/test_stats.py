@@ -0,0 +1,56 @@
+import pytest
+
+from tests.test_files import XLSX_FILE
+from xlsx2html import xlsx2html
+from xlsx2html.stats import ConversionStats
+
+
+def test_nested_phases():
+    now = [0]
+    calls = []
+    stats = ConversionStats(
+        callback=lambda *args: calls.append(args), clock=lambda: now[0]
+    )
+    stats.sheet = "Sheet"
+    with stats.phase("render_table"):
+        now[0] += 1
+        stats.start("format_cell")
+        now[0] += 2
+        stats.stop("0.00")
+        now[0] += 3
+    for _ in stats.iter_phase("read_rows", range(3)):
+        now[0] += 10
+    assert stats.phases == {"render_table": 4, "format_cell": 2, "read_rows": 0}
+    assert stats.sheets["Sheet"]["render_table"] == 4
+    assert stats.top_formats() == [("0.00", 1, 2)]
+    # Not for the cell phases, once for an iterated one
+    assert calls == [("render_table", "Sheet", 6), ("read_rows", "Sheet", 0)]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_conversion_stats(streaming):
+    stats = ConversionStats()
+    html = xlsx2html(XLSX_FILE, sheet=-1, streaming=streaming, stats=stats).getvalue()
+    assert html == xlsx2html(XLSX_FILE, sheet=-1, streaming=streaming).getvalue()
+
+    report = stats.report()
+    assert set(report["phases"]) >= {
+        "load_workbook",
+        "layout",
+        "merged_cell_map",
+        "read_rows",
+        "format_cell",
+        "styles",
+        "render_table",
+    }
+    assert report["counters"]["cells"] == html.count("<td ")
+    assert report["sheet_counters"]["Лист 1"]["merges"] == 7
+    assert report["sheet_counters"]["Лист 1"]["styled_cells"] == 144
+    assert sum(cells for _, cells, _ in stats.top_formats(100)) == html.count("<td ")
+    assert "General" in stats.format_report()
+
+
+def test_parallel_stats():
+    stats = ConversionStats()
+    xlsx2html(XLSX_FILE, sheet=-1, workers=2, stats=stats)
+    assert set(stats.phases) == {"render_sheets"}
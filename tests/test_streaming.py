@@ -0,0 +1,146 @@
+import io
+import types
+
+import openpyxl
+import pytest
+
+from tests.test_files import XLSX_FILE, get_fixture
+from xlsx2html import xlsx2html
+from xlsx2html.core import worksheet_to_data
+from xlsx2html.reader import SheetLayout, StreamCell, find_merged_cell_ranges
+
+
+def render(*args, **kwargs):
+    stream = xlsx2html(*args, **kwargs)
+    stream.seek(0)
+    return stream.read()
+
+
+@pytest.fixture()
+def big_xlsx(temp_file):
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for i in range(1, 201):
+        ws.append([i, "row %s" % i, i * 1.5])
+    ws["A1"].font = openpyxl.styles.Font(b=True)
+    ws["B2"].hyperlink = "https://example.com/"
+    ws.merge_cells("A5:C6")
+    ws.row_dimensions[10].hidden = True
+    ws.row_dimensions[11].height = 30
+    ws.column_dimensions["B"].width = 40
+    # Gap between rows
+    ws["A250"] = "last"
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize(
+    "name,parse_formula",
+    [
+        ("example.xlsx", False),
+        ("hyperlinks.xlsx", True),
+        ("cell_range_value.xlsx", True),
+        ("image.xlsx", False),
+    ],
+)
+def test_streaming_same_as_full(name, parse_formula):
+    kw = dict(locale="en", sheet=-1, parse_formula=parse_formula)
+    assert render(get_fixture(name), streaming=True, **kw) == render(
+        get_fixture(name), streaming=False, **kw
+    )
+
+
+def test_streaming_generated(big_xlsx):
+    full_html = render(big_xlsx, streaming=False)
+    assert full_html == render(big_xlsx, streaming=True)
+    assert "row 200" in full_html
+    assert "last" in full_html
+    assert 'colspan="3"' in full_html
+
+
+def test_streaming_auto(big_xlsx):
+    # Below both limits
+    wb_html = render(big_xlsx)
+    assert wb_html == render(big_xlsx, streaming_cell_count=100)
+    assert wb_html == render(big_xlsx, streaming_file_size=100)
+
+
+@pytest.mark.parametrize("streaming_cell_count,read_only", [(1000, False), (100, True)])
+def test_streaming_auto_loads_workbook_once(
+    big_xlsx, monkeypatch, streaming_cell_count, read_only
+):
+    loads = []
+    original_load_workbook = openpyxl.load_workbook
+
+    def load_workbook(*args, **kwargs):
+        loads.append(kwargs)
+        return original_load_workbook(*args, **kwargs)
+
+    monkeypatch.setattr(openpyxl, "load_workbook", load_workbook)
+    render(big_xlsx, streaming_cell_count=streaming_cell_count)
+    assert [kwargs["read_only"] for kwargs in loads] == [read_only]
+
+
+def test_worksheet_to_data_rows_generator():
+    wb = openpyxl.load_workbook(XLSX_FILE, read_only=True, data_only=True)
+    data = worksheet_to_data(wb.worksheets[0])
+    assert isinstance(data["rows"], types.GeneratorType)
+    first_row = next(data["rows"])
+    assert first_row
+    wb.close()
+
+
+def test_streaming_cell_interface(big_xlsx):
+    wb = openpyxl.load_workbook(big_xlsx, read_only=True)
+    full_wb = openpyxl.load_workbook(big_xlsx)
+    cell = StreamCell(wb.active, 1, 1, 1, style_id=1)
+    full_cell = full_wb.active["A1"]
+    assert cell._style.numFmtId == full_cell._style.numFmtId
+    assert cell.font.b == full_cell.font.b
+    assert cell.hyperlink is None
+    assert StreamCell(wb.active, 1, 1, None, style_id=None)._style.fontId == 0
+    wb.close()
+
+
+@pytest.mark.parametrize(
+    "merged,values", [("A1:B6", {"A1": "x", "C1": "y"}), ("A1:B2", {})]
+)
+def test_streaming_merge_past_last_row(temp_file, merged, values):
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for coordinate, value in values.items():
+        ws[coordinate] = value
+    ws.merge_cells(merged)
+    wb.save(path)
+
+    full_html = render(path, streaming=False)
+    assert full_html == render(path, streaming=True)
+    rows = int(merged[-1])
+    assert full_html.count("<tr>") == rows
+    assert 'rowspan="%s"' % rows in full_html
+
+
+def test_streaming_merged_borders_single_pass(big_xlsx, monkeypatch):
+    full_html = render(big_xlsx, streaming=False)
+
+    def read_cells(self, cells):
+        assert not cells, "the sheet is parsed again"
+        return {}
+
+    monkeypatch.setattr(SheetLayout, "_read_cells", read_cells)
+    assert render(big_xlsx, streaming=True) == full_html
+
+
+def test_find_merged_cell_ranges():
+    xml = (
+        b'<x:worksheet xmlns:x="ns"><x:sheetData><x:row r="1"/></x:sheetData>'
+        b'<x:mergeCells count="2"><x:mergeCell ref="A1:B2"/>'
+        b"<x:mergeCell ref='C3:D4' /></x:mergeCells></x:worksheet>"
+    )
+    for chunk_size in (5, 1024):
+        ranges = find_merged_cell_ranges(io.BytesIO(xml), chunk_size=chunk_size)
+        assert ranges == ["A1:B2", "C3:D4"]
+    assert find_merged_cell_ranges(io.BytesIO(b"<worksheet/>")) == []
@@ -0,0 +1,120 @@
+import openpyxl
+import pytest
+from openpyxl.styles import Border, Side
+
+from tests.test_files import XLSX_FILE
+from xlsx2html import core, xlsx2html
+from xlsx2html.core import (
+    CellStyles,
+    StyleSheet,
+    get_merged_cell_map,
+    get_styles_from_cell,
+    use_css_classes,
+    worksheet_to_data,
+)
+from xlsx2html.reader import SheetLayout
+
+
+def test_cell_styles_computed_once_per_style(monkeypatch):
+    wb = openpyxl.load_workbook(XLSX_FILE, data_only=True)
+    ws = wb.worksheets[0]
+
+    calls = []
+
+    def counted_get_styles_from_cell(*args, **kwargs):
+        calls.append(args)
+        return get_styles_from_cell(*args, **kwargs)
+
+    monkeypatch.setattr(core, "get_styles_from_cell", counted_get_styles_from_cell)
+    cell_styles = CellStyles()
+    data = worksheet_to_data(ws, cell_styles=cell_styles)
+    cells_count = sum(len(row) for row in data["rows"])
+    assert len(calls) == len(cell_styles.styles)
+    assert len(calls) < cells_count / 5
+
+    # Reused by the next sheet of the workbook
+    worksheet_to_data(ws, cell_styles=cell_styles)
+    assert len(calls) == len(cell_styles.styles)
+
+
+def test_cell_styles_same_as_get_styles_from_cell():
+    wb = openpyxl.load_workbook(XLSX_FILE, data_only=True)
+    ws = wb.worksheets[0]
+    cell_styles = CellStyles(default_cell_border="1px solid")
+    for row in ws.iter_rows():
+        for cell in row:
+            assert cell_styles.get(cell) == get_styles_from_cell(
+                cell, default_cell_border="1px solid"
+            )
+
+
+@pytest.mark.parametrize("read_only", [False, True])
+def test_merged_cell_borders_from_edges(temp_file, read_only):
+    path = temp_file(extension=".xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.merge_cells("B2:D40")
+    thick = Side(style="thick", color="FF0000")
+    # Only the borders of the top left and bottom right cells are kept
+    ws["C3"].border = Border(left=thick, top=thick)
+    ws["C40"].border = Border(bottom=thick)
+    ws["D40"].border = Border(right=thick, top=thick)
+    ws["E45"] = 1
+    wb.save(path)
+
+    wb = openpyxl.load_workbook(path, read_only=read_only, data_only=True)
+    layout = SheetLayout(wb.active)
+    merged_cell_map, excluded_cells = get_merged_cell_map(layout)
+    assert list(merged_cell_map) == [(2, 2)]
+    info = merged_cell_map[(2, 2)]
+    assert info["attrs"] == {"colspan": 3, "rowspan": 39}
+    assert [len(info["edges"][b_dir]) for b_dir in ("right", "top")] == [39, 3]
+    assert (2, 2) not in excluded_cells
+    assert (40, 4) in excluded_cells
+    assert (41, 4) not in excluded_cells
+
+    styles = CellStyles().get(layout.get_cells([(2, 2)])[(2, 2)], info)
+    assert styles["border-right-style"] == "solid"
+    assert styles["border-right-color"] == "#FF0000"
+    assert styles["border-left"] == "none"
+    assert styles["border-top"] == "none"
+    assert styles["border-bottom"] == "none"
+    wb.close()
+
+    # The html doesn't depend on the mode
+    assert xlsx2html(path, streaming=True).getvalue() == (
+        xlsx2html(path, streaming=False).getvalue()
+    )
+
+
+def test_cell_data_compat_view():
+    wb = openpyxl.load_workbook(XLSX_FILE, data_only=True)
+    ws = wb.worksheets[0]
+    data = worksheet_to_data(ws)
+    cells = [cell for row in data["rows"] for cell in row]
+    merged = next(cell for cell in cells if cell.merge_attrs)
+    assert set(merged) == {
+        "column",
+        "row",
+        "value",
+        "formatted_value",
+        "attrs",
+        "style",
+    }
+    assert merged["attrs"]["id"] == "%s!%s" % (
+        ws.title,
+        ws.cell(merged.row, merged.column).coordinate,
+    )
+    assert merged["attrs"]["colspan"] or merged["attrs"]["rowspan"]
+    assert merged["style"]["height"] == merged.height
+    assert dict(merged)["formatted_value"] == merged.formatted_value
+
+    # Cells of the same style share it
+    styles = {id(cell.styles) for cell in cells}
+    assert len(styles) < len(cells) / 5
+    assert not hasattr(merged, "__dict__")
+
+    stylesheet = StyleSheet()
+    rows = list(use_css_classes([cells], stylesheet))
+    assert rows[0][0]["style"] is None
+    assert rows[0][0]["attrs"]["class"].startswith("x2h-s")
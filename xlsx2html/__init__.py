@@ -1,12 +1,30 @@
 # -*- coding: utf-8 -*-
 import warnings
-from .core import xlsx2html
-
-__all__ = ["xls2html", "xlsx2html"]
 
+# Keys of the conversion cache depend on it
 __version__ = "0.6.3"
 
+__all__ = ["iter_xlsx2html", "xls2html", "xlsx2html", "xlsx2html_range"]
+
+# Imported from .core on first use: openpyxl takes most of the startup time
+_CORE_ATTRS = ("iter_xlsx2html", "xlsx2html", "xlsx2html_range")
+
+
+def __getattr__(name):
+    if name not in _CORE_ATTRS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    from . import core
+
+    value = globals()[name] = getattr(core, name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_CORE_ATTRS))
+
 
 def xls2html(*args, **kwargs):
     warnings.warn("This func was renamed to xlsx2html.", DeprecationWarning)
+    from .core import xlsx2html
+
     return xlsx2html(*args, **kwargs)
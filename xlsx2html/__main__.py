@@ -2,7 +2,17 @@ import sys
 from . import xlsx2html
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["batch"]:
+        from .batch import main
+
+        sys.exit(main(sys.argv[2:]))
+    if sys.argv[1:2] == ["serve"]:
+        from .server import main
+
+        sys.exit(main(sys.argv[2:]))
     if len(sys.argv[1:]) < 2:
         print("Usage: xlsx2html input.xlsx output.html")
+        print("       xlsx2html batch --help")
+        print("       xlsx2html serve --help")
         sys.exit()
     xlsx2html(sys.argv[1], sys.argv[2])
@@ -0,0 +1,102 @@
+"""
+Asyncio API: the conversion runs in an executor and the html comes
+back as an async iterator of chunks, e.g. for a streaming ASGI response::
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [...]})
+        async for chunk in aiter_xlsx2html("example.xlsx", encoding="utf-8"):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+"""
+
+import asyncio
+import threading
+import weakref
+
+from .core import iter_xlsx2html
+
+# Concurrent conversions of each event loop without a semaphore of the caller
+MAX_CONCURRENT_CONVERSIONS = 4
+# Chunks are sent back to the event loop in batches of about this many characters
+CHUNK_SIZE = 64 * 1024
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_default_semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_CONVERSIONS)
+    return semaphore
+
+
+class ChunkReader:
+    """
+    Reads the chunks of a conversion in executor threads, a batch at a time.
+    :meth:`close` stops the conversion after the current chunk (table row).
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    def read(self, size=CHUNK_SIZE):
+        """Return the next chunks, an empty list when done"""
+        with self.lock:
+            batch = []
+            length = 0
+            while length < size and not self.cancelled:
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    break
+                batch.append(chunk)
+                length += len(chunk)
+            return batch
+
+    def close(self):
+        self.cancelled = True
+        with self.lock:
+            self.chunks.close()
+
+
+async def aiter_xlsx2html(
+    filepath, executor=None, semaphore=None, chunk_size=CHUNK_SIZE, **options
+):
+    """
+    Same as :func:`xlsx2html.iter_xlsx2html`, but an async iterator.
+    Reading and rendering run in `executor`, the event loop is never blocked.
+    When the iteration is stopped or cancelled, the conversion stops
+    after the current table row.
+
+    :param executor: ``None`` - the default executor of the loop
+    :param semaphore: :class:`asyncio.Semaphore` limiting concurrent conversions,
+        by default at most :data:`MAX_CONCURRENT_CONVERSIONS` per event loop
+    :param chunk_size: join chunks up to about this many characters
+    :param options: :func:`xlsx2html.iter_xlsx2html` keyword arguments
+    """
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        semaphore = get_default_semaphore()
+    async with semaphore:
+        reader = ChunkReader(iter_xlsx2html(filepath, **options))
+        try:
+            while True:
+                batch = await loop.run_in_executor(executor, reader.read, chunk_size)
+                if not batch:
+                    break
+                yield batch[0][:0].join(batch)
+        finally:
+            # Waits for the chunk being rendered, then closes the workbook
+            await loop.run_in_executor(executor, reader.close)
+
+
+async def axlsx2html(filepath, executor=None, semaphore=None, **options):
+    """Return the html document as :func:`xlsx2html.xlsx2html` does, as a string"""
+    chunks = []
+    async for chunk in aiter_xlsx2html(
+        filepath, executor=executor, semaphore=semaphore, **options
+    ):
+        chunks.append(chunk)
+    return "".join(chunks)
@@ -0,0 +1,210 @@
+"""
+Convert many workbooks with a pool of worker processes::
+
+    python -m xlsx2html batch --jobs 4 --output-dir html/ reports/ 'archive/**/*.xlsx'
+    find reports -name '*.xlsx' | python -m xlsx2html batch --jobs 4
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import xlsx2html
+from .format.number import get_locale
+
+INPUT_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def iter_input_files(sources):
+    """Yield workbooks of directories, glob patterns and file paths"""
+    for source in sources:
+        if os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                # Skip Excel lock files
+                if name.startswith("~$") or not name.lower().endswith(INPUT_EXTENSIONS):
+                    continue
+                yield os.path.join(source, name)
+        elif glob.has_magic(source):
+            yield from sorted(glob.glob(source, recursive=True))
+        else:
+            yield source
+
+
+def parse_sheet(value):
+    """
+    A sheet name or index of the command line
+
+    >>> parse_sheet("-1"), parse_sheet("Sheet1"), parse_sheet(None)
+    (-1, 'Sheet1', None)
+    """
+    if value is not None and value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def iter_manifest(lines):
+    """Yield ``(input, output or None)`` of lines ``input[<TAB>output]``"""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        input_path, _, output_path = line.partition("\t")
+        yield input_path, output_path or None
+
+
+def get_output_path(input_path, output_dir=None):
+    name = os.path.splitext(input_path)[0] + ".html"
+    if output_dir:
+        name = os.path.join(output_dir, os.path.basename(name))
+    return name
+
+
+def is_up_to_date(input_path, output_path):
+    try:
+        return os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+    except OSError:
+        return False
+
+
+def convert_file(task, **options):
+    """
+    Convert one ``(input, output)`` pair, return the error message or ``None``.
+
+    The html is written next to the output and renamed when done,
+    so a failed conversion never leaves an up to date output.
+    """
+    input_path, output_path = task
+    tmp_path = output_path + ".tmp"
+    try:
+        xlsx2html(input_path, tmp_path, **options).close()
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return "%s: %s" % (type(e).__name__, e)
+    return None
+
+
+def _warm_up(locale):
+    # Runs once per worker process, before its first file
+    get_locale(locale)
+
+
+def convert_batch(tasks, jobs=None, force=False, on_error=None, **options):
+    """
+    Convert ``(input, output)`` pairs in a pool of ``jobs`` processes.
+
+    :param force: convert even if the output is newer than the input
+    :param on_error: called with the input path and the error message
+    :param options: :func:`xlsx2html.xlsx2html` keyword arguments
+    :return: ``{"converted": int, "skipped": int, "failed": [(input, error)],
+        "seconds": float}``
+    """
+    started = time.perf_counter()
+    stats = {"converted": 0, "skipped": 0, "failed": []}
+    todo = []
+    for task in tasks:
+        if not force and is_up_to_date(*task):
+            stats["skipped"] += 1
+        else:
+            todo.append(task)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(todo) <= 1:
+        results = (convert_file(task, **options) for task in todo)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=min(jobs, len(todo)),
+            initializer=_warm_up,
+            initargs=(options.get("locale", "en"),),
+        )
+        futures = [executor.submit(convert_file, task, **options) for task in todo]
+        results = (future.result() for future in futures)
+    try:
+        for (input_path, _), error in zip(todo, results):
+            if error is None:
+                stats["converted"] += 1
+                continue
+            stats["failed"].append((input_path, error))
+            if on_error is not None:
+                on_error(input_path, error)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def format_summary(stats):
+    """
+    >>> format_summary({"converted": 10, "skipped": 2, "failed": [], "seconds": 4})
+    'Converted 10 files (2.5 files/s), skipped 2 up to date, 0 failed in 4.00s'
+    """
+    seconds = stats["seconds"]
+    rate = stats["converted"] / seconds if seconds else 0
+    return (
+        "Converted %s files (%.1f files/s), skipped %s up to date, %s failed in %.2fs"
+        % (
+            stats["converted"],
+            rate,
+            stats["skipped"],
+            len(stats["failed"]),
+            seconds,
+        )
+    )
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m xlsx2html batch",
+        description="Convert workbooks of directories, glob patterns "
+        "or a manifest read from stdin (lines 'input.xlsx[<TAB>output.html]')",
+    )
+    parser.add_argument(
+        "sources", nargs="*", help="files, directories or glob patterns"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes")
+    parser.add_argument("-o", "--output-dir", help="default: next to the input")
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="convert up to date files"
+    )
+    parser.add_argument("--locale", default="en")
+    parser.add_argument(
+        "--sheet", default=None, help="name or index, -1 for all sheets"
+    )
+    parser.add_argument("--parse-formula", action="store_true")
+    parser.add_argument("--css-classes", action="store_true")
+    options = parser.parse_args(args)
+
+    if options.sources and options.sources != ["-"]:
+        tasks = [
+            (path, get_output_path(path, options.output_dir))
+            for path in iter_input_files(options.sources)
+        ]
+    else:
+        tasks = [
+            (path, output or get_output_path(path, options.output_dir))
+            for path, output in iter_manifest(sys.stdin)
+        ]
+    if options.output_dir:
+        os.makedirs(options.output_dir, exist_ok=True)
+
+    def on_error(input_path, error):
+        print("FAILED %s: %s" % (input_path, error), file=sys.stderr)
+
+    stats = convert_batch(
+        tasks,
+        jobs=options.jobs,
+        force=options.force,
+        on_error=on_error,
+        locale=options.locale,
+        sheet=parse_sheet(options.sheet),
+        parse_formula=options.parse_formula,
+        css_classes=options.css_classes,
+    )
+    print(format_summary(stats))
+    return 1 if stats["failed"] else 0
@@ -0,0 +1,329 @@
+"""
+On-disk cache of converted html, keyed by content hashes.
+
+A document entry lists the keys of its sheet entries. A sheet key hashes
+the parts of the archive the sheet is rendered from, so after a re-upload
+where one sheet changed only that sheet is rendered again.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import posixpath
+import re
+import types
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Parts rendered per sheet or not rendered at all
+SHEET_PART_PREFIXES = ("xl/worksheets/", "xl/drawings/", "xl/media/")
+IGNORED_PARTS = ("[Content_Types].xml", "xl/calcChain.xml", "xl/sharedStrings.xml")
+IGNORED_PART_PREFIXES = ("docProps/",)
+
+RE_REL_TARGET = re.compile(rb"<Relationship\b[^>]*>")
+RE_TARGET = re.compile(rb'\bTarget="([^"]*)"')
+RE_BOOK_VIEWS = re.compile(rb"<(\w+:)?bookViews\b.*?</(\w+:)?bookViews>", re.S)
+RE_SHARED_STRING = re.compile(rb"<si>.*?</si>", re.S)
+RE_STRING_CELL = re.compile(rb'<c\b[^>]*?\bt="s"[^>]*(?<!/)>(.*?)</c>', re.S)
+RE_STRING_CELL_TYPE = re.compile(rb"""\bt=["']s["']""")
+RE_VALUE = re.compile(rb"<v>(\d+)</v>")
+
+
+def get_function_name(func):
+    return "%s.%s" % (func.__module__, func.__qualname__)
+
+
+def get_value_key(value, seen=()):
+    """
+    ``repr`` of a value made of constants, containers and functions,
+    ``None`` if it contains other objects: their repr may not tell them apart
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        items = [get_value_key(item, seen) for item in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort(key=str)
+    elif isinstance(value, dict):
+        items = [get_value_key(item, seen) for item in sorted(value.items(), key=repr)]
+    elif isinstance(value, types.CodeType):
+        items = [
+            value.co_code,
+            value.co_names,
+            value.co_varnames,
+            *(get_value_key(const, seen) for const in value.co_consts),
+        ]
+    elif callable(value):
+        return get_function_key(value, seen)
+    else:
+        return None
+    if None in items:
+        return None
+    return "%s(%r)" % (type(value).__name__, items)
+
+
+def get_function_key(func, seen=()):
+    """
+    Identity of a function made of its name, code, defaults and the values
+    of its closure, the same in other processes.
+    ``None`` if it depends on objects without one.
+
+    >>> def make(n):
+    ...     return lambda: n
+    >>> get_function_key(make(1)) == get_function_key(make(1))
+    True
+    >>> get_function_key(make(1)) == get_function_key(make(2))
+    False
+    >>> get_function_key(make(object())) is None
+    True
+    """
+    if id(func) in seen:
+        # Recursive closure
+        return get_function_name(func)
+    seen = {*seen, id(func)}
+    if isinstance(func, functools.partial):
+        parts = [func.func, func.args, func.keywords]
+    elif isinstance(func, types.FunctionType):
+        parts = [
+            func.__code__,
+            func.__defaults__,
+            func.__kwdefaults__,
+            tuple(cell.cell_contents for cell in func.__closure__ or ()),
+        ]
+    elif isinstance(func, types.BuiltinFunctionType) or (
+        isinstance(func, type) and "<locals>" not in func.__qualname__
+    ):
+        return get_function_name(func)
+    else:
+        # Bound methods and other callable objects
+        return None
+    key = get_value_key(tuple(parts), seen)
+    if key is None:
+        return None
+    return "%s:%s" % (get_function_name(getattr(func, "func", func)), key)
+
+
+def hash_options(options):
+    """
+    Hash of conversion options, functions by :func:`get_function_key`.
+    ``None`` if a function has no stable identity, such options are not cached.
+
+    >>> hash_options({"locale": "en", "sheet": None}) == hash_options(
+    ...     {"sheet": None, "locale": "en"}
+    ... )
+    True
+    >>> hash_options({"append_headers": lambda data, html: None}) == hash_options(
+    ...     {"append_headers": lambda data, html: html.append("<caption>")}
+    ... )
+    False
+    """
+    items = []
+    for name, value in sorted(options.items()):
+        if callable(value):
+            value = get_function_key(value)
+            if value is None:
+                return None
+        items.append((name, value))
+    return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+
+def hash_source(filepath):
+    """sha1 of a path or a seekable binary file"""
+    digest = hashlib.sha1()
+    if isinstance(filepath, (str, os.PathLike)):
+        with open(filepath, "rb") as f:
+            for data in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(data)
+    else:
+        filepath.seek(0)
+        for data in iter(lambda: filepath.read(HASH_CHUNK_SIZE), b""):
+            digest.update(data)
+        filepath.seek(0)
+    return digest.hexdigest()
+
+
+def get_rels_path(path):
+    directory, name = posixpath.split(path)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def iter_related_parts(archive, path, seen=None):
+    """Yield the part and the parts it refers to (drawings, images), recursively"""
+    if seen is None:
+        seen = set()
+    if path in seen:
+        return
+    seen.add(path)
+    yield path
+    rels_path = get_rels_path(path)
+    try:
+        rels = archive.read(rels_path)
+    except KeyError:
+        return
+    yield rels_path
+    for rel in RE_REL_TARGET.findall(rels):
+        target = RE_TARGET.search(rel)
+        if target is None or b'TargetMode="External"' in rel:
+            continue
+        target = target.group(1).decode("utf-8")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(path), target))
+        if target in archive.NameToInfo:
+            yield from iter_related_parts(archive, target, seen)
+
+
+class SheetDigests:
+    """Content hashes of the sheets of an open archive"""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self._shared_strings = None
+        self._shared_strings_digest = None
+        self.common = self._get_common_digest()
+
+    def _get_common_digest(self):
+        # Styles, themes, the workbook: parts every sheet is rendered with
+        digest = hashlib.sha1()
+        for name in sorted(self.archive.namelist()):
+            if name in IGNORED_PARTS or name.startswith(IGNORED_PART_PREFIXES):
+                continue
+            if name.startswith(SHEET_PART_PREFIXES):
+                continue
+            data = self.archive.read(name)
+            if name == "xl/workbook.xml":
+                # The selected sheet changes on every save
+                data = RE_BOOK_VIEWS.sub(b"", data)
+            digest.update(name.encode("utf-8") + b"\0" + data)
+        return digest.hexdigest()
+
+    def _read_shared_strings(self):
+        if self._shared_strings is None:
+            try:
+                data = self.archive.read("xl/sharedStrings.xml")
+            except KeyError:
+                data = b""
+            self._shared_strings = RE_SHARED_STRING.findall(data)
+            self._shared_strings_digest = hashlib.sha1(data).digest()
+        return self._shared_strings
+
+    def update_shared_strings(self, digest, data):
+        """Hash the shared strings the sheet xml refers to"""
+        cells = RE_STRING_CELL.findall(data)
+        strings = self._read_shared_strings()
+        indexes = []
+        for cell in cells:
+            value = RE_VALUE.search(cell)
+            if value is None:
+                break
+            indexes.append(int(value.group(1)))
+        if len(indexes) != len(RE_STRING_CELL_TYPE.findall(data)) or any(
+            i >= len(strings) for i in indexes
+        ):
+            # Unexpected markup, fall back to all of the strings
+            digest.update(self._shared_strings_digest)
+            return
+        for i in indexes:
+            digest.update(strings[i])
+
+    def get(self, path, title, options_key, all_sheets=()):
+        """
+        :param path: sheet part, ``ws._worksheet_path`` of a read-only sheet
+        :param all_sheets: parts of other sheets the sheet depends on,
+            e.g. hyperlinks of formulas pointing to them
+        """
+        digest = hashlib.sha1()
+        digest.update(("%s\0%s\0%s\0" % (options_key, self.common, title)).encode())
+        for sheet_path in [path, *all_sheets]:
+            for name in iter_related_parts(self.archive, sheet_path):
+                data = self.archive.read(name)
+                digest.update(name.encode("utf-8") + b"\0" + data)
+                if name.startswith("xl/worksheets/") and name.endswith(".xml"):
+                    self.update_shared_strings(digest, data)
+        return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    Directory of converted html entries with size based LRU eviction.
+    Safe to share between processes: entries are written to a temporary
+    file and renamed.
+
+    :param max_size: evict least recently used entries above this many bytes
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        """Return the stored value or ``None``"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            # Recently used entries are evicted last
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        tmp_path = "%s.%s.tmp" % (path, os.getpid())
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    def clear(self):
+        for _, _, path in self._entries():
+            os.remove(path)
+
+    def info(self):
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size": sum(entry_size for _, entry_size, _ in entries),
+            "max_size": self.max_size,
+        }
@@ -1,8 +1,3 @@
-import openpyxl
-from packaging import version
-
-OPENPYXL_24 = version.parse(openpyxl.__version__) < version.parse("2.5")
-
 try:
     import warnings
 
@@ -14,7 +9,29 @@ except ImportError:
     from typing import BinaryIO  # noqa: F401
 
 
-try:
-    from babel.numbers import number_re  # type: ignore[attr-defined]
-except ImportError:
-    from babel.numbers import _number_pattern_re as number_re  # noqa: F401
+def get_openpyxl_24():
+    import openpyxl
+    from packaging import version
+
+    return version.parse(openpyxl.__version__) < version.parse("2.5")
+
+
+def get_number_re():
+    try:
+        from babel.numbers import number_re  # type: ignore[attr-defined]
+    except ImportError:
+        from babel.numbers import _number_pattern_re as number_re
+    return number_re
+
+
+# Computed on first use, not to import openpyxl, packaging and babel
+# with the modules only needing BinaryIO
+_LAZY_ATTRS = {"OPENPYXL_24": get_openpyxl_24, "number_re": get_number_re}
+
+
+def __getattr__(name):
+    get_value = _LAZY_ATTRS.get(name)
+    if get_value is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = globals()[name] = get_value()
+    return value
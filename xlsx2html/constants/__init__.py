@@ -1,4 +1,14 @@
-from .builtin import BUILTIN_FORMATS
-from .locale_format import LCID_HEX_MAP
-
 __all__ = ["BUILTIN_FORMATS", "LCID_HEX_MAP"]
+
+# Imported on first use, LCID_HEX_MAP is only needed for formats with a locale
+_LAZY_ATTRS = {"BUILTIN_FORMATS": "builtin", "LCID_HEX_MAP": "locale_format"}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    from importlib import import_module
+
+    value = globals()[name] = getattr(import_module("." + module, __name__), name)
+    return value
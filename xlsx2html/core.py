@@ -1,22 +1,42 @@
+import base64
 import contextlib
 import io
+import os
+import re
 from collections import defaultdict
-from typing import List
+from collections.abc import Mapping
+from functools import partial
+from itertools import groupby
+from typing import List, Optional
 
-import openpyxl
-import six
 from openpyxl.chart.shapes import GraphicalProperties
 from openpyxl.drawing.image import Image
 from openpyxl.drawing.spreadsheet_drawing import AnchorMarker
 from openpyxl.styles.colors import COLOR_INDEX, aRGB_REGEX
-from openpyxl.utils import column_index_from_string, rows_from_range, units
+from openpyxl.utils import (
+    column_index_from_string,
+    get_column_letter,
+    range_boundaries,
+    units,
+)
 from openpyxl.utils.escape import unescape
 from openpyxl.worksheet.worksheet import Worksheet
 
-from xlsx2html.compat import OPENPYXL_24
+from xlsx2html import __version__
+from xlsx2html.cache import SheetDigests, hash_options, hash_source
 from xlsx2html.constants.border import BORDER_STYLES, DEFAULT_BORDER_STYLE
-from xlsx2html.format import format_cell
-from xlsx2html.utils.image import bytes_to_datauri
+from xlsx2html.format import format_cell, format_value
+from xlsx2html.format.hyperlink import is_hyperlink_formula
+from xlsx2html.reader import (
+    STREAMING_CELL_COUNT,
+    STREAMING_FILE_SIZE,
+    SheetLayout,
+    WorkbookFormulas,
+    get_seekable_source,
+    load_workbook,
+)
+from xlsx2html.stats import NO_STATS
+from xlsx2html.utils.image import DeferredImageStore, ImageStore, bytes_to_datauri
 
 
 def render_attrs(attrs):
@@ -39,6 +59,70 @@ def render_inline_styles(styles):
     )
 
 
+class StyleSheet:
+    """
+    Interns each distinct set of cell styles into a css class,
+    so cells only carry ``class="x2h-s0"``.
+    """
+
+    class_prefix = "x2h-s"
+    cell_class_re = re.compile(r'<td class="(x2h-s\d+)"')
+
+    def __init__(self):
+        self.classes = {}
+
+    def add(self, styles):
+        """Return the class name for the styles dict"""
+        return self.add_css(render_inline_styles(styles))
+
+    def add_css(self, css):
+        class_name = self.classes.get(css)
+        if class_name is None:
+            class_name = self.classes[css] = "%s%s" % (
+                self.class_prefix,
+                len(self.classes),
+            )
+        return class_name
+
+    def merge(self, html, classes):
+        """
+        Add ``classes`` of another stylesheet and rename them in its ``html``
+
+        >>> stylesheet = StyleSheet()
+        >>> stylesheet.add({"color": "red"})
+        'x2h-s0'
+        >>> stylesheet.merge('<td class="x2h-s0">', {"color: blue": "x2h-s0"})
+        '<td class="x2h-s1">'
+        """
+        names = {class_name: self.add_css(css) for css, class_name in classes.items()}
+        return self.cell_class_re.sub(
+            lambda m: '<td class="%s"' % names[m.group(1)], html
+        )
+
+    def render(self):
+        rules = ["<style>"]
+        for css, class_name in self.classes.items():
+            rules.append(".%s {%s}" % (class_name, css))
+        rules.append("</style>")
+        return "\n".join(rules)
+
+
+def use_css_classes(rows, stylesheet):
+    """Move cell styles of the rows into the stylesheet"""
+    classes = {}
+    for row in rows:
+        for cell in row:
+            key = (id(cell.styles), cell.height)
+            try:
+                cell.css_class = classes[key][1]
+            except KeyError:
+                cell.css_class = stylesheet.add(cell.style)
+                # Keeps the styles alive, so their id isn't reused
+                classes[key] = (cell.styles, cell.css_class)
+            cell.styles = None
+        yield row
+
+
 def normalize_color(color):
     # TODO RGBA
     rgb = None
@@ -59,9 +143,13 @@ def normalize_color(color):
     return None
 
 
-def get_border_style_from_cell(cell):
+BORDER_DIRECTIONS = ("right", "left", "top", "bottom")
+DEFAULT_ROW_HEIGHT = 19
+
+
+def get_border_style_from_cell(cell, directions=BORDER_DIRECTIONS):
     h_styles = {}
-    for b_dir in ["right", "left", "top", "bottom"]:
+    for b_dir in directions:
         b_s = getattr(cell.border, b_dir)
         if not b_s:
             continue
@@ -84,11 +172,14 @@ def get_styles_from_cell(cell, merged_cell_map=None, default_cell_border="none")
     merged_cell_map = merged_cell_map or {}
 
     h_styles = {"border-collapse": "collapse"}
-    b_styles = get_border_style_from_cell(cell)
     if merged_cell_map:
-        # TODO edged_cells
-        for m_cell in merged_cell_map["cells"]:
-            b_styles.update(get_border_style_from_cell(m_cell))
+        # Only the outer borders of the edge cells are visible
+        b_styles = {}
+        for b_dir, m_cells in merged_cell_map["edges"].items():
+            for m_cell in m_cells:
+                b_styles.update(get_border_style_from_cell(m_cell, [b_dir]))
+    else:
+        b_styles = get_border_style_from_cell(cell)
 
     for b_dir in ["border-right", "border-left", "border-top", "border-bottom"]:
         style_tag = b_dir + "-style"
@@ -119,14 +210,149 @@ def get_styles_from_cell(cell, merged_cell_map=None, default_cell_border="none")
     return h_styles
 
 
+class CellStyles:
+    """
+    Workbook-level table of cell css.
+
+    Cells share a small table of styles (``wb._cell_styles``), so css is
+    computed once per distinct style (and merged range borders), not per cell.
+    """
+
+    def __init__(self, default_cell_border="none"):
+        self.default_cell_border = default_cell_border
+        self.styles = {}
+
+    def get(self, cell, merged_cell_info=None):
+        """Same as :func:`get_styles_from_cell`, the result must not be changed"""
+        key = cell._style
+        if merged_cell_info:
+            # Runs of the same border give the same result
+            key = (
+                key,
+                tuple(
+                    tuple(
+                        border_id
+                        for border_id, _ in groupby(
+                            m_cell._style.borderId for m_cell in m_cells
+                        )
+                    )
+                    for m_cells in merged_cell_info["edges"].values()
+                ),
+            )
+        try:
+            return self.styles[key]
+        except KeyError:
+            styles = self.styles[key] = get_styles_from_cell(
+                cell, merged_cell_info, self.default_cell_border
+            )
+            return styles
+
+
 def get_cell_id(cell):
     return "{}!{}".format(cell.parent.title, cell.coordinate)
 
 
-def image_to_data(image: Image) -> dict:
+class CellData(Mapping):
+    """
+    Converted cell. Cells of a sheet share the objects of their styles,
+    merged range attributes, row height and sheet title.
+
+    Also a mapping with the keys of the dicts used before:
+    ``column``, ``row``, ``value``, ``formatted_value``, ``attrs``, ``style``.
+    ``attrs`` and ``style`` are built on access and can't be set, change
+    `merge_attrs` and `styles` instead. ``dict(cell)`` is a copy,
+    :func:`render_table` renders dict cells too.
+
+    >>> cell = CellData("Sheet", 2, 3, 5, "5", "19pt", {"color": "red"})
+    >>> cell["attrs"], cell["style"]
+    ({'id': 'Sheet!C2'}, {'height': '19pt', 'color': 'red'})
+    >>> cell["formatted_value"] = "five"
+    >>> cell.formatted_value
+    'five'
+    """
+
+    __slots__ = (
+        "sheet",
+        "row",
+        "column",
+        "value",
+        "formatted_value",
+        "height",
+        "styles",
+        "merge_attrs",
+        "css_class",
+    )
+    keys_ = ("column", "row", "value", "formatted_value", "attrs", "style")
+
+    def __init__(
+        self,
+        sheet,
+        row,
+        column,
+        value,
+        formatted_value,
+        height,
+        styles,
+        merge_attrs=None,
+    ):
+        self.sheet = sheet
+        self.row = row
+        self.column = column
+        self.value = value
+        self.formatted_value = formatted_value
+        self.height = height
+        # Shared, see CellStyles.get; None once moved to a css class
+        self.styles = styles
+        # Shared colspan and rowspan of a merged range
+        self.merge_attrs = merge_attrs
+        self.css_class = None
+
+    @property
+    def id(self):
+        return "%s!%s%s" % (self.sheet, get_column_letter(self.column), self.row)
+
+    @property
+    def attrs(self):
+        attrs = {"id": self.id}
+        if self.merge_attrs:
+            attrs.update(self.merge_attrs)
+        if self.css_class is not None:
+            attrs["class"] = self.css_class
+        return attrs
+
+    @property
+    def style(self):
+        if self.styles is None:
+            return None
+        return {"height": self.height, **self.styles}
+
+    def __getitem__(self, key):
+        if key not in self.keys_:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key in ("attrs", "style"):
+            raise TypeError("%r is built on access, it can't be set" % key)
+        if key not in self.keys_:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self.keys_)
+
+    def __len__(self):
+        return len(self.keys_)
+
+
+def image_to_data(image: Image, image_store: Optional[ImageStore] = None) -> dict:
     _from: AnchorMarker = image.anchor._from
     graphicalProperties: GraphicalProperties = image.anchor.pic.graphicalProperties
     transform = graphicalProperties.transform
+    size = transform.ext if transform is not None else None
+    if size is None:
+        # No <a:xfrm>, e.g. images saved by openpyxl: the size is in the anchor
+        size = image.anchor.ext
     # http://officeopenxml.com/drwSp-location.php
     offsetX = units.EMU_to_pixels(_from.colOff)
     offsetY = units.EMU_to_pixels(_from.rowOff)
@@ -135,123 +361,250 @@ def image_to_data(image: Image) -> dict:
         "col": _from.col + 1,
         "row": _from.row + 1,
         "offset": {"x": offsetX, "y": offsetY},
-        "width": units.EMU_to_pixels(transform.ext.width),
-        "height": units.EMU_to_pixels(transform.ext.height),
-        "src": bytes_to_datauri(image.ref, image.path),
+        "width": units.EMU_to_pixels(size.width),
+        "height": units.EMU_to_pixels(size.height),
         "style": {
             "margin-left": f"{offsetX}px",
             "margin-top": f"{offsetY}px",
             "position": "absolute",
         },
     }
+    if image_store is None:
+        data["src"] = bytes_to_datauri(image.ref, image.path)
+        return data
+
+    key = image_store.add(image.ref, image.path)
+    if image_store.mode == "assets":
+        data["src"] = image_store.get_src(key)
+        data["loading"] = "lazy"
+    else:
+        data["class"] = image_store.get_class(key)
+        data["style"].update(
+            {
+                "display": "inline-block",
+                "width": "{}px".format(data["width"]),
+                "height": "{}px".format(data["height"]),
+                "background-size": "100% 100%",
+            }
+        )
     return data
 
 
-def images_to_data(ws: Worksheet):
-    images: List[Image] = ws._images
+def render_image(img):
+    styles = render_inline_styles(img["style"])
+    if img.get("class"):
+        # Shared image, the data URI is in the css class
+        return '<span class="{}" style="{}"></span>'.format(img["class"], styles)
+    if img.get("loading"):
+        return (
+            '<img width="{width}" height="{height}" style="{styles_str}" '
+            'src="{src}" loading="{loading}"/>'
+        ).format(styles_str=styles, **img)
+    return (
+        '<img width="{width}" height="{height}"'
+        'style="{styles_str}"'
+        'src="{src}"'
+        "/>"
+    ).format(styles_str=styles, **img)
+
+
+def images_to_data(
+    ws: Worksheet,
+    images: Optional[List[Image]] = None,
+    image_store: Optional[ImageStore] = None,
+):
+    if images is None:
+        images = ws._images
 
     images_data = defaultdict(list)
     for _i in images:
-        _id = image_to_data(_i)
+        _id = image_to_data(_i, image_store)
         images_data[(_id["col"], _id["row"])].append(_id)
     return images_data
 
 
-def worksheet_to_data(ws, locale=None, fs=None, default_cell_border="none"):
-    merged_cell_map = {}
-    if OPENPYXL_24:
-        merged_cell_ranges = ws.merged_cell_ranges
-        excluded_cells = set(ws.merged_cells)
-    else:
-        merged_cell_ranges = [cell_range.coord for cell_range in ws.merged_cells.ranges]
-        excluded_cells = set(
-            [
-                cell
-                for cell_range in merged_cell_ranges
-                for rows in rows_from_range(cell_range)
-                for cell in rows
-            ]
-        )
-
-    for cell_range in merged_cell_ranges:
-        if ":" not in str(cell_range):
-            cell_range_list = list(ws[f"{cell_range}:{cell_range}"])  # noqa: E231
-        else:
-            cell_range_list = list(ws[cell_range])
+def get_merged_cell_map(layout):
+    """
+    Return ``{(row, column): merged cell info}`` for the top left cells
+    of the merged ranges and the :class:`xlsx2html.reader.MergedCellIndex`
+    of the cells hidden by them.
+    Only the borders of the edge cells of a range are read.
 
-        m_cell = cell_range_list[0][0]
+    Ranges crossing the bounds of the layout are cut to them. If the
+    top left cell is cut off, it is in the info as ``"cell"``.
+    """
+    merged_cells = layout.merged_cells
+    range_edges = {}
+    edge_cells = set()
+    anchors = {}
+    for bounds in merged_cells.ranges:
+        min_row = max(bounds[0], layout.min_row)
+        min_col = max(bounds[1], layout.min_column)
+        max_row = min(bounds[2], layout.max_row)
+        max_col = min(bounds[3], layout.max_column)
+        if min_row > max_row or min_col > max_col:
+            continue
+        if (min_row, min_col) != bounds[:2]:
+            anchors[(min_row, min_col)] = bounds[:2]
+        rows = range(min_row, max_row + 1)
+        columns = range(min_col, max_col + 1)
+        edges = {
+            "right": [(row, max_col) for row in rows],
+            "left": [(row, min_col) for row in rows],
+            "top": [(min_row, column) for column in columns],
+            "bottom": [(max_row, column) for column in columns],
+        }
+        range_edges[(min_row, min_col, max_row, max_col)] = edges
+        for coords in edges.values():
+            edge_cells.update(coords)
 
-        colspan = len(cell_range_list[0])
-        rowspan = len(cell_range_list)
-        merged_cell_map[m_cell.coordinate] = {
+    cells = layout.get_edge_cells(edge_cells)
+    anchor_cells = layout.get_cells(set(anchors.values()))
+    merged_cell_map = {}
+    for (min_row, min_col, max_row, max_col), edges in range_edges.items():
+        colspan = max_col - min_col + 1
+        rowspan = max_row - min_row + 1
+        merged_cell_map[(min_row, min_col)] = info = {
             "attrs": {
                 "colspan": None if colspan <= 1 else colspan,
                 "rowspan": None if rowspan <= 1 else rowspan,
             },
-            "cells": [c for rows in cell_range_list for c in rows],
+            "edges": {
+                b_dir: [cells[coord] for coord in coords if coord in cells]
+                for b_dir, coords in edges.items()
+            },
         }
+        if (min_row, min_col) in anchors:
+            info["cell"] = anchor_cells[anchors[(min_row, min_col)]]
+    return merged_cell_map, merged_cells
 
-        excluded_cells.remove(m_cell.coordinate)
-
-    max_col_number = 0
 
-    data_list = []
-    for row_i, row in enumerate(ws.iter_rows()):
+def iter_worksheet_rows(
+    layout,
+    merged_cell_map,
+    excluded_cells,
+    locale=None,
+    fs=None,
+    default_cell_border="none",
+    cell_styles=None,
+    stats=None,
+):
+    cell_styles = cell_styles or CellStyles(default_cell_border)
+    row_heights = layout.row_heights
+    visible_columns = layout.visible_columns
+    default_height = f"{DEFAULT_ROW_HEIGHT}pt"
+    # Other cells skip the hyperlink formatting
+    hyperlinks = layout.hyperlinks
+    # Legacy: formula worksheet read in step with the values one
+    f_rows = SheetLayout(fs).iter_rows() if fs is not None else None
+    rows = layout.iter_rows()
+    if stats is not None:
+        rows = stats.iter_phase("read_rows", rows)
+    for row in rows:
+        f_row = next(f_rows) if f_rows is not None else None
         data_row = []
-        data_list.append(data_row)
-        for col_i, cell in enumerate(row):
-            row_dim = ws.row_dimensions[cell.row]
-
-            if cell.coordinate in excluded_cells or row_dim.hidden:
+        if not row:
+            yield data_row
+            continue
+        row_index = row[0].row
+        if row_index in row_heights:
+            height = row_heights[row_index]
+            if height is None:
+                # Hidden row
+                yield data_row
                 continue
+            height = f"{round(height, 2)}pt"
+        else:
+            height = default_height
+        title = row[0].parent.title
 
-            if col_i > max_col_number:
-                max_col_number = col_i
-
-            height = 19
-
-            if row_dim.customHeight:
-                height = round(row_dim.height, 2)
+        for col_i in visible_columns:
+            if col_i >= len(row):
+                break
+            cell = row[col_i]
+            key = (row_index, cell.column)
+            if key in excluded_cells and key not in merged_cell_map:
+                continue
+            merged_cell_info = merged_cell_map.get(key, {})
+            # The range starts before the window, show its top left cell
+            value_cell = merged_cell_info.get("cell") or cell
 
-            f_cell = None
-            if fs:
-                f_cell = fs[cell.coordinate]
-            value = cell.value
+            if f_row:
+                f_cell = f_row[col_i]
+            else:
+                f_cell = layout.get_formula_cell(value_cell)
+            value = value_cell.value
             if isinstance(value, str):
                 value = unescape(value)
-            cell_data = {
-                "column": cell.column,
-                "row": cell.row,
-                # Raw value for internal use
-                "value": value,
-                "formatted_value": format_cell(cell, locale=locale, f_cell=f_cell),
-                "attrs": {"id": get_cell_id(cell)},
-                "style": {"height": f"{height}pt"},
-            }
-            merged_cell_info = merged_cell_map.get(cell.coordinate, {})
-            if merged_cell_info:
-                cell_data["attrs"].update(merged_cell_info["attrs"])
-            cell_data["style"].update(
-                get_styles_from_cell(cell, merged_cell_info, default_cell_border)
+            if stats is not None:
+                count_cell(stats, value_cell)
+                stats.start("format_cell")
+            linked = (value_cell.row, value_cell.column) in hyperlinks
+            if linked or is_hyperlink_formula(f_cell):
+                formatted_value = format_cell(
+                    value_cell, locale=locale, f_cell=f_cell, value=value
+                )
+            else:
+                formatted_value = format_value(value_cell, value, locale=locale)
+            if stats is not None:
+                stats.stop(value_cell.number_format)
+                stats.start("styles")
+            styles = cell_styles.get(value_cell, merged_cell_info)
+            if stats is not None:
+                stats.stop()
+            data_row.append(
+                CellData(
+                    title,
+                    row_index,
+                    cell.column,
+                    # Raw value for internal use
+                    value,
+                    formatted_value,
+                    height,
+                    styles,
+                    merged_cell_info.get("attrs"),
+                )
             )
-            data_row.append(cell_data)
+        yield data_row
 
+
+def count_cell(stats, cell):
+    stats.count("cells")
+    # Not cell.has_style: streamed cells of the default style have a style id
+    if cell._style is not None and any(cell._style):
+        stats.count("styled_cells")
+    if cell.hyperlink:
+        stats.count("hyperlinks")
+
+
+def columns_to_data(layout):
     col_list = []
-    max_col_number += 1
+    if layout.max_column < layout.min_column:
+        # A window right of the used columns
+        return col_list
+    max_col_number = layout.max_column - layout.min_column + 1
 
     column_dimensions = sorted(
-        ws.column_dimensions.items(), key=lambda d: column_index_from_string(d[0])
+        layout.column_dimensions.items(), key=lambda d: column_index_from_string(d[0])
     )
 
     for col_i, col_dim in column_dimensions:
         if not all([col_dim.min, col_dim.max]):
             continue
+        # Columns before the window
+        count = col_dim.max - max(col_dim.min, layout.min_column) + 1
+        if count <= 0:
+            continue
+        if col_dim.hidden:
+            # Cells of hidden columns are skipped too
+            max_col_number -= count
+            continue
         width = 0.89
         if col_dim.customWidth:
             width = round(col_dim.width / 10.0, 2)
         col_width = 96 * width
 
-        for _ in six.moves.range((col_dim.max - col_dim.min) + 1):
+        for _ in range(count):
             max_col_number -= 1
             col_list.append(
                 {
@@ -262,10 +615,111 @@ def worksheet_to_data(ws, locale=None, fs=None, default_cell_border="none"):
             )
             if max_col_number < 0:
                 break
-    return {"rows": data_list, "cols": col_list, "images": images_to_data(ws)}
+    return col_list
 
 
-def render_table(data, append_headers, append_lineno):
+def worksheet_to_data(
+    ws,
+    locale=None,
+    fs=None,
+    default_cell_border="none",
+    formulas=None,
+    cell_styles=None,
+    image_store=None,
+    read_images=True,
+    trim_empty=True,
+    max_rows=None,
+    max_columns=None,
+    window=None,
+    stats=None,
+):
+    """
+    Collect cells, columns and images of the worksheet.
+
+    For a read-only (streaming) worksheet ``rows`` is a generator
+    and the sheet is read row by row during rendering.
+
+    :param fs: worksheet of the same workbook loaded with ``data_only=False``
+    :param formulas: ``True`` - read formulas of a read-only worksheet in the same
+        pass as values; for a full one ``{(row, column): formula cell}``,
+        see :meth:`xlsx2html.reader.WorkbookFormulas.get_sheet_formulas`
+    :param cell_styles: :class:`CellStyles` shared by the sheets of the workbook
+    :param image_store: :class:`xlsx2html.utils.image.ImageStore` shared by the sheets,
+        images are inlined as data URIs without it
+    :param read_images: ``False`` - skip images
+    :param trim_empty: drop trailing rows and columns that show nothing
+    :param max_rows: convert at most this many rows
+    :param max_columns: convert at most this many columns
+    :param window: ``(min_row, min_column, max_row, max_column)`` - convert
+        only these cells, see :class:`xlsx2html.reader.SheetLayout`
+    :param stats: :class:`xlsx2html.stats.ConversionStats`
+    """
+    timer = stats or NO_STATS
+    with timer.phase("layout"):
+        layout = SheetLayout(
+            ws,
+            formulas=formulas,
+            read_images=read_images,
+            trim_empty=trim_empty,
+            max_rows=max_rows,
+            max_columns=max_columns,
+            window=window,
+        )
+        cols = columns_to_data(layout)
+    with timer.phase("merged_cell_map"):
+        merged_cell_map, excluded_cells = get_merged_cell_map(layout)
+    with timer.phase("images"):
+        images = images_to_data(ws, layout.images, image_store)
+    timer.count("merges", len(merged_cell_map))
+    timer.count("images", len(layout.images))
+
+    rows = iter_worksheet_rows(
+        layout,
+        merged_cell_map,
+        excluded_cells,
+        locale=locale,
+        fs=fs,
+        default_cell_border=default_cell_border,
+        cell_styles=cell_styles,
+        stats=stats,
+    )
+    if not layout.streaming:
+        rows = list(rows)
+
+    return {
+        "rows": rows,
+        "cols": cols,
+        "images": images,
+        "image_store": image_store,
+        "min_row": layout.min_row,
+        "min_column": layout.min_column,
+        "max_row": layout.max_row,
+        "max_column": layout.max_column,
+        "total_rows": layout.total_rows,
+        "total_columns": layout.total_columns,
+    }
+
+
+def iter_worksheet_cells(ws):
+    """
+    Yield the rows of cells of the worksheet the way the converter reads them
+    and passes them to :func:`xlsx2html.format.format_cell`,
+    e.g. to time formatting on its own. A read-only worksheet is streamed.
+    """
+    return SheetLayout(ws).iter_rows()
+
+
+def iter_table(data, append_headers, append_lineno):
+    """
+    Yield the html table piece by piece: the opening tag with ``<colgroup>``,
+    then each ``<tr>``, then ``</table>``.
+    ``"".join(iter_table(...))`` is the whole table.
+    Shared images new in the table are written before it.
+    """
+    image_store = data.get("image_store")
+    if image_store is not None:
+        yield from image_store.iter_styles()
+
     html = [
         "<table  "
         'style="border-collapse: collapse" '
@@ -274,10 +728,7 @@ def render_table(data, append_headers, append_lineno):
         'cellpadding="0">'
         "<colgroup>"
     ]
-    hidden_columns = set()
     for col in data["cols"]:
-        if col["hidden"]:
-            hidden_columns.add(col["index"])
         html.append(
             '<col {attrs} style="{styles}">'.format(
                 attrs=render_attrs(col.get("attrs")),
@@ -287,42 +738,62 @@ def render_table(data, append_headers, append_lineno):
     html.append("</colgroup>")
 
     append_headers(data, html)
+    yield "\n".join(html)
 
+    images = data["images"]
+    # (id of shared styles, height): (styles, rendered css)
+    inline_styles = {}
     for i, row in enumerate(data["rows"]):
         trow = ["<tr>"]
         append_lineno(trow, i)
         for cell in row:
-            if cell["column"] in hidden_columns:
-                continue
-            images = data["images"].get((cell["column"], cell["row"])) or []
-            formatted_images = []
-            for img in images:
-                styles = render_inline_styles(img["style"])
-                img_tag = (
-                    '<img width="{width}" height="{height}"'
-                    'style="{styles_str}"'
-                    'src="{src}"'
-                    "/>"
-                ).format(styles_str=styles, **img)
-                formatted_images.append(img_tag)
+            if not isinstance(cell, CellData):
+                # A dict cell, as given by the earlier versions
+                attrs_str = render_attrs(cell.get("attrs"))
+                styles_str = render_inline_styles(cell.get("style"))
+                if styles_str:
+                    attrs_str += ' style="{}"'.format(styles_str)
+                column, row_index = cell["column"], cell["row"]
+                formatted_value = cell["formatted_value"]
+            else:
+                column, row_index = cell.column, cell.row
+                formatted_value = cell.formatted_value
+                if cell.merge_attrs or cell.css_class is not None:
+                    attrs_str = render_attrs(cell.attrs)
+                else:
+                    attrs_str = 'id="%s"' % cell.id
+                if cell.styles is not None:
+                    # Cells using css classes have no inline styles
+                    key = (id(cell.styles), cell.height)
+                    try:
+                        styles_str = inline_styles[key][1]
+                    except KeyError:
+                        styles_str = render_inline_styles(cell.style)
+                        inline_styles[key] = (cell.styles, styles_str)
+                    if styles_str:
+                        attrs_str += ' style="{}"'.format(styles_str)
+            cell_images = images.get((column, row_index)) if images else None
             trow.append(
-                (
-                    '<td {attrs_str} style="{styles_str}">'
-                    "{formatted_images}"
-                    "{formatted_value}"
-                    "</td>"
-                ).format(
-                    attrs_str=render_attrs(cell["attrs"]),
-                    styles_str=render_inline_styles(cell["style"]),
-                    formatted_images="\n".join(formatted_images),
-                    **cell,
+                "<td {attrs_str}>{formatted_images}{formatted_value}</td>".format(
+                    attrs_str=attrs_str,
+                    formatted_images="\n".join(
+                        [render_image(img) for img in cell_images or ()]
+                    ),
+                    formatted_value=formatted_value,
                 )
             )
 
         trow.append("</tr>")
-        html.append("\n".join(trow))
-    html.append("</table>")
-    return "\n".join(html)
+        yield "\n" + "\n".join(trow)
+    yield "\n</table>"
+
+
+def render_table(data, append_headers=None, append_lineno=None):
+    return "".join(
+        iter_table(
+            data, append_headers or append_nothing, append_lineno or append_nothing
+        )
+    )
 
 
 HTML_TEMPLATE = """
@@ -337,12 +808,18 @@ HTML_TEMPLATE = """
     </body>
     </html>
     """
+HTML_HEADER, HTML_FOOTER = HTML_TEMPLATE.split("%s")
 
 
 def render_data_to_html(data, append_headers, append_lineno):
     return HTML_TEMPLATE % render_table(data, append_headers, append_lineno)
 
 
+def append_nothing(dumb1, dumb2):
+    """Default ``append_headers`` and ``append_lineno``"""
+    return True
+
+
 def get_sheet(wb, sheet):
     ws = wb.active
     if sheet is not None:
@@ -353,15 +830,560 @@ def get_sheet(wb, sheet):
     return ws
 
 
+def iter_xlsx2html(
+    filepath,
+    locale="en",
+    sheet=None,
+    parse_formula=False,
+    append_headers=append_nothing,
+    append_lineno=append_nothing,
+    default_cell_border="none",
+    streaming=None,
+    streaming_file_size=STREAMING_FILE_SIZE,
+    streaming_cell_count=STREAMING_CELL_COUNT,
+    css_classes=False,
+    encoding=None,
+    workers=None,
+    images="inline",
+    assets_dir="assets",
+    assets_url=None,
+    trim_empty=True,
+    max_rows=None,
+    max_columns=None,
+    cache=None,
+    stats=None,
+):
+    """
+    Same as :func:`xlsx2html` but yields the html document in chunks
+    (header, each table row, footer) instead of writing it to output.
+
+    :param encoding: if set - yield bytes, e.g. to use the generator
+        as a WSGI response iterable
+    :return: generator of str or bytes
+    """
+    filepath = get_seekable_source(filepath)
+    # worksheet_to_data arguments
+    sheet_options = dict(
+        locale=locale,
+        default_cell_border=default_cell_border,
+        read_images=images != "none",
+        trim_empty=trim_empty,
+        max_rows=max_rows,
+        max_columns=max_columns,
+    )
+    if images not in ("inline", "none"):
+        sheet_options["image_store"] = ImageStore(
+            images, assets_dir=assets_dir, assets_url=assets_url
+        )
+    sheet_list = [sheet]
+    if isinstance(sheet, (list, tuple)):
+        # TODO any iterable
+        sheet_list = list(sheet)
+    chunks = None
+    options_key = None
+    if cache is not None:
+        # None with a function option without a stable identity, not cached then
+        options_key = hash_options(
+            dict(
+                sheet_options,
+                image_store=None,
+                images=images,
+                assets_dir=assets_dir,
+                assets_url=assets_url,
+                parse_formula=parse_formula,
+                append_headers=append_headers,
+                append_lineno=append_lineno,
+                css_classes=css_classes,
+                version=__version__,
+            )
+        )
+    if options_key is not None:
+        tables = _iter_cached_tables(
+            filepath,
+            sheet_list,
+            cache,
+            sheet_options,
+            options_key,
+            parse_formula=parse_formula,
+            append_headers=append_headers,
+            append_lineno=append_lineno,
+            css_classes=css_classes,
+        )
+        chunks = _iter_tables_document(
+            _add_shared_images(tables, sheet_options.get("image_store")), css_classes
+        )
+    elif workers and workers > 1 and (sheet == -1 or len(sheet_list) > 1):
+        chunks = _iter_parallel_document(
+            filepath,
+            sheet_list,
+            workers,
+            sheet_options,
+            parse_formula=parse_formula,
+            append_headers=append_headers,
+            append_lineno=append_lineno,
+            css_classes=css_classes,
+        )
+    if chunks is not None:
+        if stats is not None:
+            # Sheets are rendered in other processes or come from the cache
+            chunks = stats.iter_phase("render_sheets", chunks)
+        for chunk in chunks:
+            if encoding:
+                chunk = chunk.encode(encoding)
+            yield chunk
+        return
+
+    timer = stats or NO_STATS
+    with timer.phase("load_workbook"):
+        wb = load_workbook(
+            filepath,
+            data_only=True,
+            streaming=streaming,
+            streaming_file_size=streaming_file_size,
+            streaming_cell_count=streaming_cell_count,
+        )
+    formulas = None
+    if parse_formula:
+        # Streaming reads formulas together with values
+        formulas = True if wb.read_only else WorkbookFormulas(filepath)
+    try:
+        if sheet == -1:
+            sheet_list = wb.sheetnames
+
+        chunks = _iter_document(
+            wb,
+            sheet_list,
+            sheet_options,
+            formulas=formulas,
+            append_headers=append_headers,
+            append_lineno=append_lineno,
+            css_classes=css_classes,
+            stats=stats,
+        )
+        for chunk in chunks:
+            if encoding:
+                chunk = chunk.encode(encoding)
+            yield chunk
+    finally:
+        if isinstance(formulas, WorkbookFormulas):
+            formulas.close()
+        wb.close()
+
+
+def _iter_document(
+    wb,
+    sheet_list,
+    sheet_options,
+    formulas,
+    append_headers,
+    append_lineno,
+    css_classes,
+    stats=None,
+):
+    def iter_sheets_data():
+        for sheet in sheet_list:
+            ws = get_sheet(wb, sheet)
+            if stats is not None:
+                stats.sheet = ws.title
+            sheet_formulas = formulas
+            if isinstance(formulas, WorkbookFormulas):
+                with timer.phase("formulas"):
+                    sheet_formulas = formulas.get_sheet_formulas(ws.title)
+
+            data = worksheet_to_data(
+                ws,
+                formulas=sheet_formulas,
+                cell_styles=cell_styles,
+                stats=stats,
+                **sheet_options,
+            )
+            if stylesheet is not None:
+                data["rows"] = use_css_classes(data["rows"], stylesheet)
+            yield ws.title, data
+
+    timer = stats or NO_STATS
+
+    cell_styles = CellStyles(sheet_options["default_cell_border"])
+    stylesheet = StyleSheet() if css_classes else None
+    sheets_data = iter_sheets_data()
+    html_header = HTML_HEADER
+    if stylesheet is not None and not wb.read_only:
+        # All rows are in memory anyway, so the stylesheet goes into <head>
+        sheets_data = list(sheets_data)
+        for _, data in sheets_data:
+            data["rows"] = list(data["rows"])
+        html_header = html_header.replace("</head>", stylesheet.render() + "\n</head>")
+        stylesheet = None
+
+    yield html_header
+    for i, (title, data) in enumerate(sheets_data):
+        if i:
+            yield "\n"
+        table = iter_table(data, append_headers, append_lineno)
+        if stats is not None:
+            stats.sheet = title
+            table = stats.iter_phase("render_table", table)
+        yield from table
+    if stylesheet is not None:
+        # Streaming: the classes are known only after all rows were written
+        yield "\n" + stylesheet.render()
+    yield HTML_FOOTER
+
+
+# Workbook of a worker process of _iter_parallel_document, set once by _init_worker
+_worker_source = None
+
+
+def _init_worker(source):
+    global _worker_source
+    _worker_source = source
+
+
+def _render_sheet_table(
+    title,
+    sheet_options,
+    parse_formula,
+    append_headers,
+    append_lineno,
+    css_classes,
+):
+    """
+    Render one sheet in a worker process.
+    Return the table html, the classes of its stylesheet and
+    ``[(name, data)]`` of the shared images to write before the table.
+    """
+    source = _worker_source
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    # Read-only mode loads only the rendered sheet
+    wb = load_workbook(source, data_only=True, streaming=True)
+    try:
+        return render_sheet_table(
+            wb[title],
+            sheet_options,
+            parse_formula=parse_formula,
+            append_headers=append_headers,
+            append_lineno=append_lineno,
+            css_classes=css_classes,
+        )
+    finally:
+        wb.close()
+
+
+def render_sheet_table(
+    ws, sheet_options, parse_formula, append_headers, append_lineno, css_classes
+):
+    """
+    Render a read-only worksheet on its own.
+    Return the table html, the classes of its stylesheet, see
+    :meth:`StyleSheet.merge`, and ``[(name, data)]`` of its shared images.
+    The css of shared images is left out of the table, so the document
+    writes each of them once, see :func:`_add_shared_images`.
+    """
+    image_store = sheet_options.get("image_store")
+    if image_store is not None and image_store.mode == "shared":
+        image_store = DeferredImageStore()
+        sheet_options = dict(sheet_options, image_store=image_store)
+    data = worksheet_to_data(
+        ws, formulas=True if parse_formula else None, **sheet_options
+    )
+    stylesheet = StyleSheet() if css_classes else None
+    if stylesheet is not None:
+        data["rows"] = use_css_classes(data["rows"], stylesheet)
+    table = render_table(data, append_headers, append_lineno)
+    images = []
+    if isinstance(image_store, DeferredImageStore):
+        images = image_store.pop_images()
+    return table, stylesheet.classes if stylesheet is not None else None, images
+
+
+def get_sheet_titles(wb, sheet_list):
+    if sheet_list == [-1]:
+        return wb.sheetnames
+    return [get_sheet(wb, sheet).title for sheet in sheet_list]
+
+
+def _iter_tables_document(tables, css_classes):
+    """Join ``(table, classes)`` of sheets rendered on their own"""
+    stylesheet = StyleSheet() if css_classes else None
+    yield HTML_HEADER
+    for i, (table, classes) in enumerate(tables):
+        if i:
+            yield "\n"
+        if stylesheet is not None:
+            table = stylesheet.merge(table, classes)
+        yield table
+    if stylesheet is not None:
+        yield "\n" + stylesheet.render()
+    yield HTML_FOOTER
+
+
+def _iter_parallel_document(
+    filepath,
+    sheet_list,
+    workers,
+    sheet_options,
+    parse_formula,
+    append_headers,
+    append_lineno,
+    css_classes,
+):
+    # Only imported with workers, multiprocessing takes long to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    wb = load_workbook(filepath, data_only=True, streaming=True)
+    try:
+        titles = get_sheet_titles(wb, sheet_list)
+    finally:
+        wb.close()
+
+    source = filepath
+    if not isinstance(filepath, (str, os.PathLike)):
+        filepath.seek(0)
+        source = filepath.read()
+
+    image_store = sheet_options.get("image_store")
+    worker_options = sheet_options
+    if image_store is not None and image_store.mode == "shared":
+        # Written here once, workers don't need the images of the document
+        worker_options = dict(sheet_options, image_store=DeferredImageStore())
+    render_sheet = partial(
+        _render_sheet_table,
+        sheet_options=worker_options,
+        parse_formula=parse_formula,
+        append_headers=append_headers,
+        append_lineno=append_lineno,
+        css_classes=css_classes,
+    )
+    # The workbook is sent to each worker once, not with every sheet
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(titles)),
+        initializer=_init_worker,
+        initargs=(source,),
+    ) as executor:
+        # Tables come back in the order of the sheets
+        tables = executor.map(render_sheet, titles)
+        yield from _iter_tables_document(
+            _add_shared_images(tables, image_store), css_classes
+        )
+
+
+def _add_shared_images(tables, image_store):
+    """
+    Write the css of the shared images of tables rendered on their own,
+    by :func:`render_sheet_table`, before the first table using them,
+    like :func:`iter_table` does
+    """
+    for table, classes, images in tables:
+        if images:
+            for name, data in images:
+                image_store.add(io.BytesIO(data), name)
+            table = "".join(image_store.iter_styles()) + table
+        yield table, classes
+
+
+def get_cache_entry_table(entry):
+    images = [(name, base64.b64decode(data)) for name, data in entry["images"]]
+    return entry["table"], entry["classes"], images
+
+
+def _iter_cached_tables(
+    filepath,
+    sheet_list,
+    cache,
+    sheet_options,
+    options_key,
+    parse_formula,
+    append_headers,
+    append_lineno,
+    css_classes,
+):
+    """
+    Yield ``(table, classes, images)`` of the sheets,
+    render the ones not in the :class:`xlsx2html.cache.ConversionCache`
+    """
+    document_key = hash_options(
+        {"source": hash_source(filepath), "options": options_key, "sheet": sheet_list}
+    )
+    sheet_keys = cache.get(document_key)
+    if sheet_keys is not None:
+        entries = [cache.get(key) for key in sheet_keys]
+        if None not in entries:
+            for entry in entries:
+                yield get_cache_entry_table(entry)
+            return
+
+    # Rendered the same way as by the workers of _iter_parallel_document
+    wb = load_workbook(filepath, data_only=True, streaming=True)
+    try:
+        digests = SheetDigests(wb._archive)
+        sheet_keys = []
+        for title in get_sheet_titles(wb, sheet_list):
+            ws = wb[title]
+            other_sheets = ()
+            if parse_formula:
+                # Hyperlinks of formulas may point to cells of other sheets
+                other_sheets = [
+                    other._worksheet_path
+                    for other in wb.worksheets
+                    if other._worksheet_path != ws._worksheet_path
+                ]
+            key = digests.get(ws._worksheet_path, title, options_key, other_sheets)
+            entry = cache.get(key)
+            if entry is None:
+                table, classes, images = render_sheet_table(
+                    ws,
+                    sheet_options,
+                    parse_formula=parse_formula,
+                    append_headers=append_headers,
+                    append_lineno=append_lineno,
+                    css_classes=css_classes,
+                )
+                entry = {
+                    "table": table,
+                    "classes": classes,
+                    # Written by the document, also on hits
+                    "images": [
+                        (name, base64.b64encode(data).decode("ascii"))
+                        for name, data in images
+                    ],
+                }
+                cache.set(key, entry)
+            sheet_keys.append(key)
+            yield get_cache_entry_table(entry)
+    finally:
+        wb.close()
+    cache.set(document_key, sheet_keys)
+
+
+def parse_cell_range(cell_range):
+    """
+    Return ``(min_column, min_row, max_column, max_row)`` of the range,
+    ``None`` for open bounds
+
+    >>> parse_cell_range("B2:D10"), parse_cell_range("A:C"), parse_cell_range("5:7")
+    ((2, 2, 4, 10), (1, None, 3, None), (None, 5, None, 7))
+    >>> parse_cell_range("C1:A1")
+    Traceback (most recent call last):
+    ...
+    ValueError: invalid cell range: 'C1:A1'
+    """
+    bounds = range_boundaries(cell_range)
+    min_column, min_row, max_column, max_row = bounds
+    reversed_columns = min_column is not None and max_column < min_column
+    reversed_rows = min_row is not None and max_row < min_row
+    if bounds == (None,) * 4 or 0 in bounds or reversed_columns or reversed_rows:
+        raise ValueError("invalid cell range: %r" % cell_range)
+    return bounds
+
+
+def xlsx2html_range(
+    filepath,
+    cell_range=None,
+    offset=0,
+    limit=None,
+    sheet=None,
+    locale="en",
+    parse_formula=False,
+    append_headers=append_nothing,
+    append_lineno=append_nothing,
+    default_cell_border="none",
+    streaming=None,
+    images="inline",
+    trim_empty=True,
+):
+    """
+    Render a part of a sheet as a ``<table>`` fragment, e.g. a page of a viewer.
+    Cells outside of it are not formatted, in streaming mode rows
+    after it are not read.
+
+    >>> page = xlsx2html_range("tests/fixtures/example.xlsx", "A:C", offset=2, limit=3)
+    >>> page["min_row"], page["max_row"], page["max_column"], page["total_rows"]
+    (3, 5, 3, 31)
+
+    :param cell_range: ``"B2:F100"``, ``"A:C"``, ``"10:20"``, ``None`` - the whole sheet.
+        A malformed range raises :class:`ValueError`. A range or an offset
+        past the used cells, or ``limit=0``, gives a table without rows.
+    :param offset: skip this many rows of the range
+    :param limit: render at most this many rows of the range
+    :param sheet: sheet name or index, ``None`` - the active one
+    :param images: ``"inline"`` or ``"none"``
+    :return: ``{"html": str, "min_row", "max_row", "min_column", "max_column",
+        "total_rows", "total_columns"}`` - the rendered bounds and the size
+        of the used range of the sheet. Merged cells crossing the bounds
+        are cut to them.
+    """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset and limit must not be negative")
+    min_row = min_column = max_row = max_column = None
+    if cell_range is not None:
+        min_column, min_row, max_column, max_row = parse_cell_range(cell_range)
+    min_row = (min_row or 1) + offset
+    if limit is not None:
+        last_row = min_row + limit - 1
+        max_row = last_row if max_row is None else min(max_row, last_row)
+
+    filepath = get_seekable_source(filepath)
+    wb = load_workbook(filepath, data_only=True, streaming=streaming)
+    workbook_formulas = formulas = None
+    try:
+        ws = get_sheet(wb, sheet)
+        if parse_formula:
+            if wb.read_only:
+                formulas = True
+            else:
+                workbook_formulas = WorkbookFormulas(filepath)
+                formulas = workbook_formulas.get_sheet_formulas(ws.title)
+        data = worksheet_to_data(
+            ws,
+            locale=locale,
+            default_cell_border=default_cell_border,
+            formulas=formulas,
+            read_images=images != "none",
+            trim_empty=trim_empty,
+            window=(min_row, min_column, max_row, max_column),
+        )
+        result = {
+            "html": render_table(data, append_headers, append_lineno),
+        }
+    finally:
+        if workbook_formulas is not None:
+            workbook_formulas.close()
+        wb.close()
+    for key in (
+        "min_row",
+        "max_row",
+        "min_column",
+        "max_column",
+        "total_rows",
+        "total_columns",
+    ):
+        result[key] = data[key]
+    return result
+
+
 def xlsx2html(
     filepath,
     output=None,
     locale="en",
     sheet=None,
     parse_formula=False,
-    append_headers=(lambda dumb1, dumb2: True),
-    append_lineno=(lambda dumb1, dumb2: True),
+    append_headers=append_nothing,
+    append_lineno=append_nothing,
     default_cell_border="none",
+    streaming=None,
+    streaming_file_size=STREAMING_FILE_SIZE,
+    streaming_cell_count=STREAMING_CELL_COUNT,
+    css_classes=False,
+    workers=None,
+    images="inline",
+    assets_dir="assets",
+    assets_url=None,
+    trim_empty=True,
+    max_rows=None,
+    max_columns=None,
+    cache=None,
+    stats=None,
 ):
     """
 
@@ -376,15 +1398,72 @@ def xlsx2html(
     :param append_headers:
     :param append_lineno:
     :param default_cell_border:
+    :param streaming: read sheets row by row in openpyxl read-only mode.
+        if `None` - enabled when the file is bigger than `streaming_file_size` bytes
+        or any sheet has more than `streaming_cell_count` cells.
+    :param streaming_file_size:
+    :param streaming_cell_count:
+    :param css_classes: put cell styles into a ``<style>`` block as classes
+        (``.x2h-s0``) instead of inline ``style`` attributes. The block is in
+        ``<head>``, or at the end of ``<body>`` in streaming mode.
+    :param workers: render several sheets in parallel with a pool of this many
+        processes. Each process reads its sheet in streaming mode, so the result
+        is the same as with `streaming=True`. `append_headers` and `append_lineno`
+        must be picklable (module level functions).
+    :param images: ``"inline"`` - a data URI in every ``<img>``;
+        ``"shared"`` - each distinct image is written once as a css class
+        with its data URI; ``"assets"`` - each distinct image is saved once
+        to `assets_dir` as ``<sha1>.<ext>`` and loaded lazily from there;
+        ``"none"`` - skip images. In streaming mode images are copied from
+        the file as is, without decoding them.
+    :param assets_dir: directory for ``images="assets"``
+    :param assets_url: url prefix of the assets in the html. By default
+        the path of `assets_dir` relative to `output`, else its name.
+    :param trim_empty: drop trailing rows and columns without values, fills,
+        borders, merged cells, hyperlinks and images, e.g. a stray formatted
+        cell at ``XFD1048576``. ``False`` - convert the whole used range.
+    :param max_rows: convert at most this many rows of each sheet,
+        ``0`` - none; a negative value raises :class:`ValueError`
+    :param max_columns: convert at most this many columns of each sheet
+    :param cache: :class:`xlsx2html.cache.ConversionCache`, reuse the html
+        of earlier conversions of the same file, or of its unchanged sheets,
+        with the same options. Sheets are rendered as with `workers`.
+        `append_headers` and `append_lineno` are keyed by their code and
+        the values they close over; with closures over other objects or
+        with bound methods the conversion is not cached.
+    :param stats: :class:`xlsx2html.stats.ConversionStats`, collects the time
+        of each phase per sheet, counters of cells, styled cells, merged cells,
+        images and hyperlinks and the slowest number formats. With `workers`
+        or `cache` only the loading and the ``render_sheets`` phase are timed.
     :return:
     """
-    wb = openpyxl.load_workbook(filepath, data_only=True)
-    sheet_list = [sheet]
-    if isinstance(sheet, (list, tuple)):
-        # TODO any iterable
-        sheet_list = sheet
-    elif sheet == -1:
-        sheet_list = wb.sheetnames
+    if images == "assets" and assets_url is None and isinstance(output, str):
+        output_dir = os.path.dirname(os.path.abspath(output))
+        assets_url = os.path.relpath(os.path.abspath(assets_dir), output_dir)
+        assets_url = assets_url.replace(os.sep, "/") + "/"
+
+    chunks = iter_xlsx2html(
+        filepath,
+        locale=locale,
+        sheet=sheet,
+        parse_formula=parse_formula,
+        append_headers=append_headers,
+        append_lineno=append_lineno,
+        default_cell_border=default_cell_border,
+        streaming=streaming,
+        streaming_file_size=streaming_file_size,
+        streaming_cell_count=streaming_cell_count,
+        css_classes=css_classes,
+        workers=workers,
+        images=images,
+        assets_dir=assets_dir,
+        assets_url=assets_url,
+        trim_empty=trim_empty,
+        max_rows=max_rows,
+        max_columns=max_columns,
+        cache=cache,
+        stats=stats,
+    )
 
     if not output:
         output = io.StringIO()
@@ -393,20 +1472,8 @@ def xlsx2html(
     if output.encoding and output.encoding not in ["utf-8", "utf-16"]:
         raise UnicodeError("output must be opened with encoding='utf-8'")
 
-    html_tables = []
-    for sheet in sheet_list:
-        ws = get_sheet(wb, sheet)
-        fs = None
-        if parse_formula:
-            fb = openpyxl.load_workbook(filepath, data_only=False)
-            fs = get_sheet(fb, sheet)
-
-        data = worksheet_to_data(
-            ws, locale=locale, fs=fs, default_cell_border=default_cell_border
-        )
-        html_tables.append(render_table(data, append_headers, append_lineno))
-
-    html = HTML_TEMPLATE % "\n".join(html_tables)
-    output.write(html)
+    # Rows are written as soon as they are rendered
+    for chunk in chunks:
+        output.write(chunk)
     output.flush()
     return output
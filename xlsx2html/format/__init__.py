@@ -1,54 +1,133 @@
-import datetime
+import sys
+from functools import lru_cache
 from html import escape as html_escape
 
-import six
-from babel.dates import LC_TIME
-from babel.numbers import LC_NUMERIC
 from openpyxl.utils.escape import unescape
 
-from xlsx2html.constants import BUILTIN_FORMATS
-
-from .dt import format_date, format_datetime, format_time, format_timedelta
 from .hyperlink import format_hyperlink
-from .locale import extract_locale_from_format
-from .number import format_decimal
-
-
-def format_cell(cell, locale=None, f_cell=None):
-    value = cell.value
-    if isinstance(value, str):
-        # Convert escaped strings to ASCIII: _x000a_ == \n
-        value = unescape(value)
-        # Escape html in str value
-        value = html_escape(value)
-    formatted_value = value if value == 0 else value or "&nbsp;"
-    cell_format = cell.number_format
-    if not cell_format:
-        return format_hyperlink(formatted_value, cell.hyperlink)
-
-    if isinstance(value, six.integer_types) or isinstance(value, float):
-        if cell_format.lower() != "general":
-            locale = locale or LC_NUMERIC
-            formatted_value = format_decimal(value, cell_format, locale=locale)
-
-    locale = locale or LC_TIME
-
-    cell_format = BUILTIN_FORMATS.get(cell._style.numFmtId, cell_format)
-    cell_format = cell_format.split(";")[0]
-
-    new_locale, cell_format = extract_locale_from_format(cell_format)
-    if new_locale:
-        locale = new_locale
-
-    if type(value) == datetime.date:
-        formatted_value = format_date(value, cell_format, locale=locale)
-    elif type(value) == datetime.datetime:
-        formatted_value = format_datetime(value, cell_format, locale=locale)
-    elif type(value) == datetime.time:
-        formatted_value = format_time(value, cell_format, locale=locale)
-    elif type(value) == datetime.timedelta:
-        formatted_value = format_timedelta(value, cell_format)
-
-    formatted_value = format_hyperlink(formatted_value, cell, f_cell)
-
-    return formatted_value
+
+# The number format machinery is imported on first use: babel takes long to
+# import and the General and text cells don't need it. name: module
+_LAZY_ATTRS = {
+    "format_date": "dt",
+    "format_datetime": "dt",
+    "format_time": "dt",
+    "format_timedelta": "dt",
+    "get_datetime_formatter": "dt",
+    "get_timedelta_formatter": "dt",
+    "extract_locale_from_format": "locale",
+    "parse_locale_code": "locale",
+    "compile_pattern": "number",
+    "format_decimal": "number",
+    "get_locale": "number",
+    "parse_hyperlink_formula": "hyperlink",
+}
+
+# Caches of parsed formats and locales, see cache_info()
+FORMAT_CACHES = {
+    "number_pattern": "compile_pattern",
+    "locale": "get_locale",
+    "format_locale": "extract_locale_from_format",
+    "locale_code": "parse_locale_code",
+    "datetime": "get_datetime_formatter",
+    "timedelta": "get_timedelta_formatter",
+    "hyperlink_formula": "parse_hyperlink_formula",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    from importlib import import_module
+
+    value = globals()[name] = getattr(import_module("." + module, __name__), name)
+    return value
+
+
+def get_cache_functions():
+    module = sys.modules[__name__]
+    return {name: getattr(module, func) for name, func in FORMAT_CACHES.items()}
+
+
+def cache_info():
+    """
+    Hits, misses and size of the format caches, e.g. to tune a long-running process
+
+    >>> cache_clear()
+    >>> cache_info()["number_pattern"]
+    CacheInfo(hits=0, misses=0, maxsize=1024, currsize=0)
+    """
+    return {name: func.cache_info() for name, func in get_cache_functions().items()}
+
+
+def cache_clear():
+    for func in get_cache_functions().values():
+        func.cache_clear()
+
+
+# The value of format_cell() is read from the cell
+CELL_VALUE = object()
+
+
+def format_text(value, cell):
+    return html_escape(value) or "&nbsp;"
+
+
+def format_empty(value, cell):
+    return "&nbsp;"
+
+
+def format_general(value, cell):
+    return value
+
+
+# Formatters of the common cells by (numFmtId, value type), the format id
+# None is for any format. They give the same as apply_number_format().
+FAST_FORMATTERS = {
+    (None, str): format_text,
+    (None, type(None)): format_empty,
+    (0, int): format_general,
+    (0, float): format_general,
+}
+
+
+def format_cell(cell, locale=None, f_cell=None, value=CELL_VALUE):
+    """
+    Return the html of the cell value
+
+    :param value: the cell value already unescaped by the caller
+
+    >>> from openpyxl import Workbook
+    >>> ws = Workbook().active
+    >>> format_cell(ws.cell(1, 1, "a_x000a_<b>"))
+    'a\\n&lt;b&gt;'
+    >>> format_cell(ws.cell(1, 2, 1.5))
+    1.5
+    """
+    if value is CELL_VALUE:
+        value = cell.value
+        if isinstance(value, str):
+            # Convert escaped strings to ASCIII: _x000a_ == \n
+            value = unescape(value)
+    return format_hyperlink(format_value(cell, value, locale), cell, f_cell)
+
+
+def format_value(cell, value, locale=None):
+    """Return the html of the unescaped cell value without a hyperlink"""
+    style = cell._style
+    value_type = type(value)
+    formatter = FAST_FORMATTERS.get(
+        (style.numFmtId if style is not None else 0, value_type)
+    ) or FAST_FORMATTERS.get((None, value_type))
+    if formatter is not None:
+        return formatter(value, cell)
+
+    return get_number_formatter()(cell, value, locale)
+
+
+@lru_cache(maxsize=None)
+def get_number_formatter():
+    from .numfmt import apply_number_format
+
+    return apply_number_format
@@ -2,7 +2,9 @@ from __future__ import unicode_literals
 
 import datetime as dt
 import re
+from functools import lru_cache
 
+from babel import Locale
 from babel import dates as babel_dates
 from babel.dates import LC_TIME
 
@@ -16,6 +18,8 @@ RE_TD_TOK = re.compile(
 MAYBE_MINUTE = ["m", "mm"]
 DATE_PERIOD = ["am/pm", "a/p"]
 
+DATETIME_FORMAT_CACHE_SIZE = 1024
+
 
 def normalize_datetime_format(fmt, fixed_for_time=False):
     has_ap = False
@@ -125,15 +129,37 @@ def normalize_datetime_format(fmt, fixed_for_time=False):
     return "".join(parts)
 
 
+class DateTimeFormatter:
+    """Excel date/time format compiled once into a babel pattern for the locale"""
+
+    __slots__ = ("pattern", "locale")
+
+    def __init__(self, fmt, locale=LC_TIME, fixed_for_time=False):
+        self.pattern = normalize_datetime_format(fmt, fixed_for_time=fixed_for_time)
+        self.locale = Locale.parse(locale or LC_TIME)
+
+    def format(self, datetime, tzinfo=None):
+        return babel_dates.format_datetime(
+            datetime, self.pattern, tzinfo=tzinfo, locale=self.locale
+        )
+
+
+@lru_cache(maxsize=DATETIME_FORMAT_CACHE_SIZE)
+def get_datetime_formatter(fmt, locale=LC_TIME, fixed_for_time=False):
+    """
+    >>> get_datetime_formatter("h:mm AM/PM", "en").pattern
+    'h:mm a'
+    """
+    return DateTimeFormatter(fmt, locale, fixed_for_time=fixed_for_time)
+
+
 def format_date(date, fmt, locale=LC_TIME):
-    fmt = normalize_datetime_format(fmt)
     datetime = dt.datetime.combine(date, dt.time())
-    return babel_dates.format_datetime(datetime, fmt, locale=locale)
+    return get_datetime_formatter(fmt, locale).format(datetime)
 
 
 def format_datetime(datetime, fmt, locale=LC_TIME, tzinfo=None):
-    fmt = normalize_datetime_format(fmt)
-    return babel_dates.format_datetime(datetime, fmt, locale=locale, tzinfo=tzinfo)
+    return get_datetime_formatter(fmt, locale).format(datetime, tzinfo=tzinfo)
 
 
 def format_time(time, fmt, locale=LC_TIME, tzinfo=None, date=None):
@@ -144,74 +170,116 @@ def format_time(time, fmt, locale=LC_TIME, tzinfo=None, date=None):
         date = dt.date(1900, 1, 6)
         fixed_for_time = True
     datetime = dt.datetime.combine(date, time)
-    fmt = normalize_datetime_format(fmt, fixed_for_time=fixed_for_time)
-    return babel_dates.format_datetime(datetime, fmt, locale=locale, tzinfo=tzinfo)
+    formatter = get_datetime_formatter(fmt, locale, fixed_for_time=fixed_for_time)
+    return formatter.format(datetime, tzinfo=tzinfo)
 
 
-def format_timedelta(timedelta, fmt):
-    e_s = timedelta.total_seconds()
-    e_m, s = divmod(e_s, 60)
-    e_m = int(e_m)
-    e_h, m = divmod(e_m, 60)
+# Values a compiled duration format refers to, see TimedeltaFormatter.format
+TD_TOTAL_HOURS, TD_TOTAL_MINUTES, TD_TOTAL_SECONDS, TD_MINUTES, TD_SECONDS = range(5)
 
-    plain = []
-    pos = 0
 
-    for match in RE_TD_TOK.finditer(fmt):
-        text = match.group(0)
-        start, end = match.span()
-        tok = text.lower()
-        plain.append(fmt[pos:start])
-        pos = end
-        tok_type = tok[0]
-        if tok_type == "[":
-            tok_type = tok[:2]
-        if tok_type == "\\":
-            # Escape sequence \*_"
-            plain.append(text[1:])
-        elif tok_type == "_":
-            # normally puts space at same size as next character; just treat as space
-            plain.append(" ")
-        elif tok_type == "*":
-            # Don't include repeating character
-            pass
-        elif tok_type == '"':
-            # Quoted string
-            plain.append(text[1:-1])
-        elif tok_type == "[h":
-            f = "{:0>" + str(len(tok) - 2) + "}"
-            plain.append(f.format(e_h))
-        elif tok_type == "[m":
-            f = "{:0>" + str(len(tok) - 2) + "}"
-            plain.append(f.format(e_m))
-        elif tok_type == "[s":
-            if "." in tok:
-                mstok = tok.split(".")[1]
-                f = "{:0" + str(len(tok) - 2) + "." + str(len(mstok)) + "f}"
-            else:
-                f = "{:0" + str(len(tok) - 2) + ".0f}"
-            plain.append(f.format(e_s))
-        elif tok == "m":
-            plain.append(str(m))
-        elif tok == "mm":
-            plain.append(f"{m:0>2}")  # noqa: E231
-        elif tok_type == "s":
-            if "." in tok:
-                mstok = tok.split(".")[1]
-                f = "".join(
-                    [
-                        "{:0",
-                        str(min(len(tok), 2) + len(mstok) + 1),
-                        ".",
-                        str(len(mstok)),
-                        "f}",
-                    ]
-                )
+class TimedeltaFormatter:
+    """
+    Excel duration format compiled once into a list of emit operations
+
+    >>> formatter = get_timedelta_formatter("[h]:mm")
+    >>> formatter.format_many([dt.timedelta(hours=30), dt.timedelta(minutes=5)])
+    ['30:00', '0:05']
+    """
+
+    __slots__ = ("ops",)
+
+    def __init__(self, fmt):
+        # (value, format string) pairs, value is None for plain text
+        ops = []
+        plain = []
+
+        def flush_plain():
+            text = "".join(plain)
+            if text:
+                ops.append((None, text))
+            plain.clear()
+
+        def emit(value, f):
+            flush_plain()
+            ops.append((value, f))
 
+        pos = 0
+        for match in RE_TD_TOK.finditer(fmt):
+            text = match.group(0)
+            start, end = match.span()
+            tok = text.lower()
+            plain.append(fmt[pos:start])
+            pos = end
+            tok_type = tok[0]
+            if tok_type == "[":
+                tok_type = tok[:2]
+            if tok_type == "\\":
+                # Escape sequence \*_"
+                plain.append(text[1:])
+            elif tok_type == "_":
+                # normally puts space at same size as next character; just treat as space
+                plain.append(" ")
+            elif tok_type == "*":
+                # Don't include repeating character
+                pass
+            elif tok_type == '"':
+                # Quoted string
+                plain.append(text[1:-1])
+            elif tok_type == "[h":
+                emit(TD_TOTAL_HOURS, "{:0>" + str(len(tok) - 2) + "}")
+            elif tok_type == "[m":
+                emit(TD_TOTAL_MINUTES, "{:0>" + str(len(tok) - 2) + "}")
+            elif tok_type == "[s":
+                if "." in tok:
+                    mstok = tok.split(".")[1]
+                    f = "{:0" + str(len(tok) - 2) + "." + str(len(mstok)) + "f}"
+                else:
+                    f = "{:0" + str(len(tok) - 2) + ".0f}"
+                emit(TD_TOTAL_SECONDS, f)
+            elif tok == "m":
+                emit(TD_MINUTES, "{}")
+            elif tok == "mm":
+                emit(TD_MINUTES, "{:0>2}")
+            elif tok_type == "s":
+                if "." in tok:
+                    mstok = tok.split(".")[1]
+                    f = "".join(
+                        [
+                            "{:0",
+                            str(min(len(tok), 2) + len(mstok) + 1),
+                            ".",
+                            str(len(mstok)),
+                            "f}",
+                        ]
+                    )
+                else:
+                    f = "{:0" + str(min(len(tok), 2)) + ".0f}"
+                emit(TD_SECONDS, f)
             else:
-                f = "{:0" + str(min(len(tok), 2)) + ".0f}"
-            plain.append(f.format(s))
-        else:
-            raise ValueError(f"Unhandled datetime token {tok}")
-    plain.append(fmt[pos:])
-    return "".join(plain)
+                raise ValueError(f"Unhandled datetime token {tok}")
+        plain.append(fmt[pos:])
+        flush_plain()
+        self.ops = tuple(ops)
+
+    def format(self, timedelta):
+        e_s = timedelta.total_seconds()
+        e_m, s = divmod(e_s, 60)
+        e_m = int(e_m)
+        e_h, m = divmod(e_m, 60)
+        values = (e_h, e_m, e_s, m, s)
+        return "".join(
+            [f if value is None else f.format(values[value]) for value, f in self.ops]
+        )
+
+    def format_many(self, timedeltas):
+        return [self.format(timedelta) for timedelta in timedeltas]
+
+
+@lru_cache(maxsize=DATETIME_FORMAT_CACHE_SIZE)
+def get_timedelta_formatter(fmt):
+    return TimedeltaFormatter(fmt)
+
+
+def format_timedelta(timedelta, fmt):
+    return get_timedelta_formatter(fmt).format(timedelta)
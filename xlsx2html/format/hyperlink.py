@@ -1,7 +1,12 @@
+import weakref
+from functools import lru_cache
+
 from openpyxl.formula.tokenizer import Tokenizer, Token
 
 from xlsx2html.utils.cell import parse_cell_location
 
+HYPERLINK_FUNC = "HYPERLINK("
+
 
 class HyperlinkType:
     __slots__ = ["location", "target", "title"]
@@ -15,6 +20,11 @@ class HyperlinkType:
         return bool(self.location or self.target)
 
 
+# Values of the cells of read-only workbooks resolved by HYPERLINK formulas:
+# a cell lookup in a read-only sheet parses the sheet up to the cell
+_resolved_values = weakref.WeakKeyDictionary()
+
+
 def resolve_cell(worksheet, coord):
     if "!" in coord:
         sheet_name, coord = coord.split("!", 1)
@@ -22,30 +32,69 @@ def resolve_cell(worksheet, coord):
     return worksheet[coord]
 
 
-def resolve_hyperlink_formula(cell, f_cell):
-    if not f_cell or f_cell.data_type != "f" or not f_cell.value.startswith("="):
+def resolve_cell_value(worksheet, coord):
+    wb = worksheet.parent
+    if not wb.read_only:
+        return resolve_cell(worksheet, coord).value
+    values = _resolved_values.setdefault(wb, {})
+    key = (worksheet.title, coord)
+    if key not in values:
+        values[key] = resolve_cell(worksheet, coord).value
+    return values[key]
+
+
+def is_hyperlink_formula(f_cell):
+    """Cheap check before tokenizing the formula"""
+    if f_cell is None or f_cell.data_type != "f":
+        return False
+    formula = f_cell.value
+    return isinstance(formula, str) and HYPERLINK_FUNC in formula
+
+
+@lru_cache(maxsize=1024)
+def parse_hyperlink_formula(formula):
+    """
+    Return ``(subtype, value)`` of the target operand of a HYPERLINK formula
+
+    >>> parse_hyperlink_formula('=HYPERLINK("https://example.com", "Example")')
+    ('TEXT', '"https://example.com"')
+    >>> parse_hyperlink_formula("=Sheet2!B2")
+    """
+    if not formula.startswith("="):
         return None
-    tokens = Tokenizer(f_cell.value).items
+    tokens = Tokenizer(formula).items
     if not tokens:
         return None
-    hyperlink = HyperlinkType(title=cell.value)
     func_token = tokens[0]
-    if func_token.type == Token.FUNC and func_token.value == "HYPERLINK(":
+    if func_token.type == Token.FUNC and func_token.value == HYPERLINK_FUNC:
         target_token = tokens[1]
         if target_token.type == Token.OPERAND:
-            target = target_token.value
-            if target_token.subtype == Token.TEXT:
-                hyperlink.target = target[1:-1]
-            elif target_token.subtype == Token.RANGE:
-                hyperlink.target = resolve_cell(cell.parent, target).value
+            return target_token.subtype, target_token.value
+    return None
+
+
+def resolve_hyperlink_formula(cell, f_cell):
+    if not is_hyperlink_formula(f_cell):
+        return None
+    target = parse_hyperlink_formula(f_cell.value)
+    if target is None:
+        return None
+    hyperlink = HyperlinkType(title=cell.value)
+    subtype, value = target
+    if subtype == Token.TEXT:
+        hyperlink.target = value[1:-1]
+    elif subtype == Token.RANGE:
+        hyperlink.target = resolve_cell_value(cell.parent, value)
 
-        if hyperlink:
-            return hyperlink
+    if hyperlink:
+        return hyperlink
 
     return None
 
 
 def format_hyperlink(value, cell, f_cell=None):
+    if not cell.hyperlink and not is_hyperlink_formula(f_cell):
+        return value
     hyperlink = HyperlinkType(title=value)
 
     if cell.hyperlink:
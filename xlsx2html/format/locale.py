@@ -1,8 +1,9 @@
 import re
+from functools import lru_cache
 
 from babel import Locale, UnknownLocaleError
 
-from xlsx2html.constants import LCID_HEX_MAP
+from xlsx2html.constants.locale_format import LCID_HEX_MAP
 
 LOCALE_FORMAT_RE = re.compile(
     r"""
@@ -16,6 +17,7 @@ LOCALE_FORMAT_RE = re.compile(
 )
 
 
+@lru_cache(maxsize=256)
 def parse_locale_code(code):
     """
     >>> parse_locale_code('-404')
@@ -34,6 +36,7 @@ def parse_locale_code(code):
         return None
 
 
+@lru_cache(maxsize=1024)
 def extract_locale_from_format(fmt):
     """
     >>> extract_locale_from_format('[$-404]e/m/d')
@@ -1,5 +1,6 @@
 import re
 from decimal import Decimal
+from functools import lru_cache
 
 from babel import Locale
 from babel.numbers import LC_NUMERIC, NumberPattern, parse_grouping
@@ -13,6 +14,9 @@ MINUS_CLEAN_RE = re.compile(r"[-]")
 CLEAN_CURRENCY_RE = re.compile(r"\[\$(.+?)(:?-[\d]+|)\]")
 COLOR_FORMAT = re.compile(r"\[([A-Z]+)\]", re.IGNORECASE)
 
+PATTERN_CACHE_SIZE = 1024
+LOCALE_CACHE_SIZE = 128
+
 
 class ColorNumberPattern(NumberPattern):
     def __init__(self, *args, **kwargs):
@@ -173,6 +177,18 @@ class PatternParser:
             return pattern.apply(number, locale)
 
 
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(format):
+    """Parse the number format once, see :func:`xlsx2html.format.cache_info`"""
+    return PatternParser(format)
+
+
+@lru_cache(maxsize=LOCALE_CACHE_SIZE)
+def get_locale(locale):
+    """Resolved :class:`babel.Locale` objects pool"""
+    return Locale.parse(locale)
+
+
 def format_decimal(number, format=None, locale=LC_NUMERIC):
     """Return the given decimal number formatted for a specific locale.
 
@@ -197,8 +213,8 @@ def format_decimal(number, format=None, locale=LC_NUMERIC):
     :param format:
     :param locale: the `Locale` object or locale identifier
     """
-    locale = Locale.parse(locale)
+    locale = get_locale(locale)
     if not format:
         format = locale.decimal_formats.get(format)
-    pattern = PatternParser(format)
+    pattern = compile_pattern(format)
     return pattern.apply(number, locale)
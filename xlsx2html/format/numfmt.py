@@ -0,0 +1,50 @@
+import datetime
+from html import escape as html_escape
+
+from babel.dates import LC_TIME
+from babel.numbers import LC_NUMERIC
+
+from xlsx2html.constants.builtin import BUILTIN_FORMATS
+
+from .dt import format_date, format_datetime, format_time, format_timedelta
+from .locale import extract_locale_from_format
+from .number import format_decimal
+
+
+def apply_number_format(cell, value, locale=None):
+    """
+    Return the html of the unescaped cell value formatted by the number
+    format of the cell, see :func:`xlsx2html.format.format_value`
+    """
+    if isinstance(value, str):
+        # Escape html in str value
+        value = html_escape(value)
+    formatted_value = value if value == 0 else value or "&nbsp;"
+    cell_format = cell.number_format
+    if not cell_format:
+        return formatted_value
+
+    if isinstance(value, (int, float)):
+        if cell_format.lower() != "general":
+            locale = locale or LC_NUMERIC
+            formatted_value = format_decimal(value, cell_format, locale=locale)
+
+    locale = locale or LC_TIME
+
+    cell_format = BUILTIN_FORMATS.get(cell._style.numFmtId, cell_format)
+    cell_format = cell_format.split(";")[0]
+
+    new_locale, cell_format = extract_locale_from_format(cell_format)
+    if new_locale:
+        locale = new_locale
+
+    if type(value) is datetime.date:
+        formatted_value = format_date(value, cell_format, locale=locale)
+    elif type(value) is datetime.datetime:
+        formatted_value = format_datetime(value, cell_format, locale=locale)
+    elif type(value) is datetime.time:
+        formatted_value = format_time(value, cell_format, locale=locale)
+    elif type(value) is datetime.timedelta:
+        formatted_value = format_timedelta(value, cell_format)
+
+    return formatted_value
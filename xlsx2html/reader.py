@@ -0,0 +1,904 @@
+import io
+import os
+import re
+from bisect import bisect_right
+from copy import copy
+
+import openpyxl
+from openpyxl.cell.read_only import ReadOnlyCell
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.packaging.relationship import (
+    RelationshipList,
+    get_dependents,
+    get_rels_path,
+)
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.styles.borders import Border
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import (
+    column_index_from_string,
+    coordinate_to_tuple,
+    range_boundaries,
+    rows_from_range,
+)
+from openpyxl.utils.cell import coordinate_from_string
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from openpyxl.worksheet._reader import FORMULA_TAG, WorkSheetParser
+from openpyxl.worksheet.dimensions import ColumnDimension, RowDimension
+from openpyxl.worksheet.formula import ArrayFormula
+from openpyxl.worksheet.merge import MergedCell
+from openpyxl.xml.constants import IMAGE_NS
+from openpyxl.xml.functions import fromstring
+
+EMPTY_STYLE = StyleArray()
+
+# openpyxl drops these pictures, browsers can't show them anyway
+SKIPPED_IMAGE_EXTENSIONS = (".wmf", ".emf")
+
+# Switch to streaming mode when the file or any converted sheet is bigger
+STREAMING_FILE_SIZE = 10 * 1024 * 1024
+STREAMING_CELL_COUNT = 500_000
+
+# <mergeCells> comes after <sheetData>, so it is looked up in the raw XML
+MERGE_CELLS_RE = re.compile(rb"<(?:\w+:)?mergeCells\b")
+MERGE_CELL_REF_RE = re.compile(
+    rb"<(?:\w+:)?mergeCell\b[^>]*?\sref\s*=\s*([\"'])(.*?)\1"
+)
+
+
+class MergedCellIndex:
+    """
+    Merged ranges as integer ``(min_row, min_col, max_row, max_col)`` bounds.
+
+    Cells are looked up by ``(row, column)`` without expanding the ranges
+    into coordinates. Lookups row by row (the way sheets are read) sweep
+    the ranges sorted by their first row, so each row only checks
+    the ranges that cross it.
+
+    >>> index = MergedCellIndex(["B2:D3", "A10:Z5000"])
+    >>> index.get_range(3, 4)
+    (2, 2, 3, 4)
+    >>> index.get_range(3, 5) is None
+    True
+    >>> index.anchor(4000, 26)
+    (10, 1)
+    >>> (2, 2) in index, (2, 3) in index
+    (False, True)
+    """
+
+    def __init__(self, cell_ranges):
+        ranges = []
+        for cell_range in cell_ranges:
+            min_col, min_row, max_col, max_row = range_boundaries(str(cell_range))
+            ranges.append((min_row, min_col, max_row, max_col))
+        ranges.sort()
+        self.ranges = ranges
+        self._starts = [bounds[0] for bounds in ranges]
+        self._row = None
+        self._active = []
+        self._next = 0
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def _row_ranges(self, row):
+        if row == self._row:
+            return self._active
+        if self._row is None or row < self._row:
+            # Restart the sweep
+            self._active = []
+            self._next = 0
+        end = bisect_right(self._starts, row, lo=self._next)
+        self._active.extend(self.ranges[self._next : end])  # noqa: E203
+        self._next = end
+        self._active = [bounds for bounds in self._active if bounds[2] >= row]
+        self._row = row
+        return self._active
+
+    def get_range(self, row, column):
+        """Bounds of the merged range containing the cell or ``None``"""
+        for bounds in self._row_ranges(row):
+            if bounds[1] <= column <= bounds[3]:
+                return bounds
+        return None
+
+    def anchor(self, row, column):
+        """Top left cell of the merged range containing the cell, else the cell"""
+        bounds = self.get_range(row, column)
+        if bounds is None:
+            return row, column
+        return bounds[0], bounds[1]
+
+    def __contains__(self, cell):
+        """Whether the cell is hidden by a merged range, the top left cell is not"""
+        row, column = cell
+        bounds = self.get_range(row, column)
+        return bounds is not None and (bounds[0], bounds[1]) != (row, column)
+
+
+class StreamCell(ReadOnlyCell):
+    """
+    Read-only cell with the parts of the :class:`openpyxl.cell.Cell`
+    interface used by the formatters.
+    """
+
+    __slots__ = ("hyperlink", "formula")
+
+    def __init__(self, sheet, row, column, value, data_type="n", style_id=0):
+        super(StreamCell, self).__init__(
+            sheet, row, column, value, data_type=data_type, style_id=style_id
+        )
+        self.hyperlink = None
+        self.formula = None
+
+    @property
+    def style_array(self):
+        # Cells missing in the sheet have no style at all, like in openpyxl
+        if self._style_id is None:
+            return EMPTY_STYLE
+        return self.parent.parent._cell_styles[self._style_id]
+
+    @property
+    def _style(self):
+        return self.style_array
+
+
+class FormulaCell:
+    """Formula of a cell, the same as ``cell.value`` of a formula workbook"""
+
+    __slots__ = ("value",)
+    data_type = "f"
+
+    def __init__(self, value):
+        self.value = value
+
+
+class SheetParser(WorkSheetParser):
+    """Skips the cells of the rows before ``min_row``"""
+
+    def __init__(self, src, shared_strings, min_row=1, **kwargs):
+        super(SheetParser, self).__init__(src, shared_strings, **kwargs)
+        self.min_row = min_row
+
+    def parse_row(self, row):
+        if self.min_row > 1:
+            row_index = row.get("r")
+            row_index = int(float(row_index)) if row_index else self.row_counter + 1
+            if row_index < self.min_row:
+                self.row_counter = row_index
+                self.skip_row(row)
+                return row_index, []
+        return super(SheetParser, self).parse_row(row)
+
+    def skip_row(self, row):
+        pass
+
+
+class FormulaParser(SheetParser):
+    """
+    Read the cached value (``<v>``) and the formula (``<f>``) of each cell
+    in a single pass. With ``values=False`` only formulas are read.
+    """
+
+    def __init__(self, src, shared_strings, values=True, **kwargs):
+        super(FormulaParser, self).__init__(
+            src, shared_strings, data_only=True, **kwargs
+        )
+        self.values = values
+
+    def skip_row(self, row):
+        # Cells of the next rows can use shared formulas of skipped ones
+        for element in row:
+            formula = element.find(FORMULA_TAG)
+            if formula is not None and formula.get("t") == "shared" and formula.text:
+                self.parse_formula(element)
+
+    def parse_cell(self, element):
+        if self.values:
+            cell = super(FormulaParser, self).parse_cell(element)
+        else:
+            coordinate = element.get("r")
+            if coordinate:
+                row, column = coordinate_to_tuple(coordinate)
+                self.col_counter = column
+            else:
+                self.col_counter += 1
+                row, column = self.row_counter, self.col_counter
+            cell = {"row": row, "column": column}
+
+        if element.find(FORMULA_TAG) is not None:
+            # Shared formulas are translated from the first cell, so parse all of them
+            formula = self.parse_formula(element)
+            if isinstance(formula, ArrayFormula):
+                formula = formula.text
+            if isinstance(formula, str):
+                cell["formula"] = FormulaCell(formula)
+        return cell
+
+
+class WorkbookFormulas:
+    """
+    Formulas of a workbook loaded in full mode.
+    Only the sheets asked for are read, one pass over each sheet XML,
+    without loading a second workbook.
+    """
+
+    def __init__(self, filepath):
+        self.reader = ExcelReader(filepath, read_only=True)
+        self.reader.read_manifest()
+        self.reader.read_workbook()
+        self.sheet_paths = {
+            sheet.name: rel.target for sheet, rel in self.reader.parser.find_sheets()
+        }
+
+    def get_sheet_formulas(self, title):
+        """Return ``{(row, column): formula cell}``"""
+        formulas = {}
+        with self.reader.archive.open(self.sheet_paths[title]) as src:
+            parser = FormulaParser(src, [], values=False)
+            for _, row in parser.parse():
+                for cell in row:
+                    if "formula" in cell:
+                        formulas[(cell["row"], cell["column"])] = cell["formula"]
+        return formulas
+
+    def close(self):
+        self.reader.archive.close()
+
+
+def is_visible_style(wb, style):
+    """Whether an empty cell of the style shows something: a fill or a border"""
+    fill = wb._fills[style.fillId]
+    if getattr(fill, "patternType", True):
+        return True
+    border = wb._borders[style.borderId]
+    return any(
+        side is not None and side.style
+        for side in (border.left, border.right, border.top, border.bottom)
+    )
+
+
+def get_visible_style_ids(wb):
+    return {
+        style_id
+        for style_id, style in enumerate(wb._cell_styles)
+        if is_visible_style(wb, style)
+    }
+
+
+class LayoutParser(WorkSheetParser):
+    """
+    Collect everything except cell values: dimensions, merged cells
+    and hyperlinks. Rows are counted but cells are never parsed.
+
+    ``used_row`` and ``used_column`` bound the cells with a value
+    or a style from ``visible_styles``. ``edge_styles`` has the style ids
+    of ``edge_cells``, ``None`` for the missing ones.
+    """
+
+    def __init__(self, src, visible_styles=(), edge_cells=()):
+        super(LayoutParser, self).__init__(src, [])
+        self.max_row = self.max_column = 0
+        self.used_row = self.used_column = 0
+        self.visible_styles = visible_styles
+        self.edge_styles = dict.fromkeys(edge_cells)
+        self.edge_columns = {}
+        for row, column in edge_cells:
+            self.edge_columns.setdefault(row, set()).add(column)
+
+    def parse_row(self, row):
+        attrs = dict(row.attrib)
+        if "r" in attrs:
+            self.row_counter = int(float(attrs["r"]))
+        else:
+            self.row_counter += 1
+
+        keys = {k for k in attrs if not k.startswith("{")}
+        if keys - {"r", "spans"}:
+            self.row_dimensions[str(self.row_counter)] = attrs
+
+        if len(row):
+            coordinate = row[-1].get("r")
+            if coordinate:
+                column = column_index_from_string(coordinate_from_string(coordinate)[0])
+            else:
+                column = len(row)
+            self.max_row = self.row_counter
+            self.max_column = max(self.max_column, column)
+            self._find_used_cells(row)
+            if self.row_counter in self.edge_columns:
+                self._find_edge_styles(row)
+        return self.row_counter, []
+
+    def _find_used_cells(self, row):
+        column = 0
+        for cell in row:
+            coordinate = cell.get("r")
+            if coordinate:
+                column = column_index_from_string(coordinate_from_string(coordinate)[0])
+            else:
+                column += 1
+            if self.row_counter <= self.used_row and column <= self.used_column:
+                continue
+            style_id = cell.get("s")
+            if len(cell) or (style_id and int(style_id) in self.visible_styles):
+                self.used_row = max(self.used_row, self.row_counter)
+                self.used_column = max(self.used_column, column)
+
+    def _find_edge_styles(self, row):
+        columns = self.edge_columns[self.row_counter]
+        column = 0
+        for cell in row:
+            coordinate = cell.get("r")
+            if coordinate:
+                column = column_index_from_string(coordinate_from_string(coordinate)[0])
+            else:
+                column += 1
+            if column in columns:
+                # Same as WorkSheetParser.parse_cell
+                self.edge_styles[(self.row_counter, column)] = int(cell.get("s", 0))
+
+
+def find_merged_cell_ranges(src, chunk_size=1024 * 1024):
+    """Return the refs of the merged ranges of a sheet XML without parsing it"""
+    tail = b""
+    for chunk in iter(lambda: src.read(chunk_size), b""):
+        data = tail + chunk
+        match = MERGE_CELLS_RE.search(data)
+        if match:
+            data = data[match.start() :] + src.read()  # noqa: E203
+            return [ref.decode() for _, ref in MERGE_CELL_REF_RE.findall(data)]
+        # A tag cut between chunks
+        tail = data[-64:]
+    return []
+
+
+class ZipImage:
+    """
+    Picture of a drawing read straight from the archive, not decoded by PIL.
+    Has the ``anchor``, ``path`` and ``ref`` of :class:`openpyxl.drawing.image.Image`
+    used to render images.
+    """
+
+    __slots__ = ("archive", "target", "anchor")
+
+    def __init__(self, archive, target, anchor):
+        self.archive = archive
+        self.target = target
+        self.anchor = anchor
+
+    @property
+    def path(self):
+        return "/" + self.target
+
+    @property
+    def ref(self):
+        """Original bytes of the picture as a file, read from the archive on access"""
+        with self.archive.open(self.target) as fp:
+            return io.BytesIO(fp.read())
+
+
+def find_zip_images(archive, drawing_path):
+    """Same as :func:`openpyxl.reader.drawings.find_images`, without charts and PIL"""
+    try:
+        drawing = SpreadsheetDrawing.from_tree(fromstring(archive.read(drawing_path)))
+    except TypeError:
+        # Unsupported DrawingML
+        return []
+    rels_path = get_rels_path(drawing_path)
+    if rels_path not in archive.namelist():
+        return []
+    deps = get_dependents(archive, rels_path)
+
+    images = []
+    for rel in drawing._blip_rels:
+        try:
+            dep = deps.get(rel.embed)
+        except KeyError:
+            continue
+        if dep.Type != IMAGE_NS or dep.target.lower().endswith(
+            SKIPPED_IMAGE_EXTENSIONS
+        ):
+            continue
+        images.append(ZipImage(archive, dep.target, rel.anchor))
+    return images
+
+
+class SheetLayout:
+    """
+    Everything about a worksheet except its cells, gathered before
+    the row loop so cells can be streamed.
+    """
+
+    def __init__(
+        self,
+        ws,
+        formulas=None,
+        read_images=True,
+        trim_empty=True,
+        max_rows=None,
+        max_columns=None,
+        window=None,
+    ):
+        """
+        :param formulas: ``True`` - read formulas of a read-only worksheet
+            together with values; ``{(row, column): formula cell}`` for a full one
+        :param read_images: ``False`` - leave `images` empty
+        :param trim_empty: drop trailing rows and columns without values,
+            visible styles, merged cells, hyperlinks and images
+        :param max_rows: read at most this many rows
+        :param max_columns: read at most this many columns
+        :param window: ``(min_row, min_column, max_row, max_column)``, read only
+            the cells inside. ``None`` bounds are open. `total_rows` and
+            `total_columns` still count the whole sheet.
+        """
+        self.ws = ws
+        self.streaming = isinstance(ws, ReadOnlyWorksheet)
+        self.formulas = formulas
+        self.read_images = read_images
+        self.trim_empty = trim_empty
+        # Cells with a value or a visible style, streaming only
+        self.used_row = self.used_column = None
+        if self.streaming:
+            self._read_streaming()
+        else:
+            self.merged_cell_ranges = [
+                cell_range.coord for cell_range in ws.merged_cells.ranges
+            ]
+            self.merged_cells = MergedCellIndex(self.merged_cell_ranges)
+            self.row_dimensions = ws.row_dimensions
+            self.column_dimensions = ws.column_dimensions
+            self.images = ws._images if read_images else []
+            # Bound to the cells on load, ``{(row, column): hyperlink}``
+            self.hyperlinks = {
+                key: cell.hyperlink for key, cell in ws._cells.items() if cell.hyperlink
+            }
+            self.max_row = ws.max_row
+            self.max_column = ws.max_column
+        if trim_empty:
+            self._trim_empty()
+        if max_rows is not None:
+            if max_rows < 0:
+                raise ValueError("max_rows must not be negative: %r" % max_rows)
+            self.max_row = min(self.max_row, max_rows)
+        if max_columns is not None:
+            if max_columns < 0:
+                raise ValueError("max_columns must not be negative: %r" % max_columns)
+            self.max_column = min(self.max_column, max_columns)
+        self.total_rows = self.max_row
+        self.total_columns = self.max_column
+        self.min_row = self.min_column = 1
+        if window is not None:
+            min_row, min_column, max_row, max_column = window
+            self.min_row = max(min_row or 1, 1)
+            self.min_column = max(min_column or 1, 1)
+            if max_row is not None:
+                self.max_row = min(self.max_row, max_row)
+            if max_column is not None:
+                self.max_column = min(self.max_column, max_column)
+        # A window past the end or a limit of 0: no rows or columns
+        self.max_row = max(self.max_row, self.min_row - 1)
+        self.max_column = max(self.max_column, self.min_column - 1)
+        self._read_visibility()
+
+    @property
+    def empty(self):
+        """Whether there are no cells to read"""
+        return self.max_row < self.min_row or self.max_column < self.min_column
+
+    def _trim_empty(self):
+        if self.streaming:
+            used_row, used_column = self.used_row, self.used_column
+            for row, column in self.hyperlinks:
+                used_row = max(used_row, row)
+                used_column = max(used_column, column)
+        else:
+            used_row, used_column = self._find_used_cells()
+        for min_row, min_col, max_row, max_col in self.merged_cells.ranges:
+            used_row = max(used_row, max_row)
+            used_column = max(used_column, max_col)
+        for image in self.images:
+            _from = image.anchor._from
+            used_row = max(used_row, _from.row + 1)
+            used_column = max(used_column, _from.col + 1)
+        # Same as openpyxl: an empty sheet still has one cell
+        self.max_row = min(self.max_row, max(used_row, 1))
+        self.max_column = min(self.max_column, max(used_column, 1))
+
+    def _find_used_cells(self):
+        wb = self.ws.parent
+        visible_styles = {}
+        used_row = used_column = 0
+        for (row, column), cell in self.ws._cells.items():
+            if row <= used_row and column <= used_column:
+                continue
+            if cell.value is None and cell.hyperlink is None:
+                style = cell._style
+                visible = visible_styles.get(style)
+                if visible is None:
+                    visible = visible_styles[style] = is_visible_style(wb, style)
+                if not visible:
+                    continue
+            used_row = max(used_row, row)
+            used_column = max(used_column, column)
+        return used_row, used_column
+
+    def _read_visibility(self):
+        # Rows with a custom height or hidden, ``{row: height or None}``
+        self.row_heights = {}
+        for row, row_dim in self.row_dimensions.items():
+            if row_dim.hidden:
+                self.row_heights[row] = None
+            elif row_dim.customHeight:
+                self.row_heights[row] = row_dim.height
+
+        hidden_columns = set()
+        for col_dim in self.column_dimensions.values():
+            if col_dim.hidden and col_dim.min and col_dim.max:
+                hidden_columns.update(range(col_dim.min, col_dim.max + 1))
+        # 0-based indexes of the shown cells of a row
+        self.visible_columns = [
+            column - self.min_column
+            for column in range(self.min_column, self.max_column + 1)
+            if column not in hidden_columns
+        ]
+
+    def _read_streaming(self):
+        ws = self.ws
+        archive = ws.parent._archive
+        rels_path = get_rels_path(ws._worksheet_path)
+        rels = RelationshipList()
+        if rels_path in archive.namelist():
+            rels = get_dependents(archive, rels_path)
+
+        visible_styles = ()
+        if self.trim_empty:
+            visible_styles = get_visible_style_ids(ws.parent)
+        # Top left and bottom right cells of the merged ranges, for their borders
+        edge_cells = set()
+        with ws._get_source() as src:
+            for bounds in MergedCellIndex(find_merged_cell_ranges(src)).ranges:
+                edge_cells.update((bounds[:2], bounds[2:]))
+        with ws._get_source() as src:
+            parser = LayoutParser(src, visible_styles, edge_cells)
+            for _ in parser.parse():
+                pass
+        self.edge_styles = parser.edge_styles
+        self._merged_styles = {}
+
+        # Same as openpyxl: an empty sheet still has one column
+        self.max_row = parser.max_row
+        self.max_column = parser.max_column or 1
+        self.used_row = parser.used_row
+        self.used_column = parser.used_column
+
+        self.merged_cell_ranges = []
+        if parser.merged_cells:
+            self.merged_cell_ranges = [
+                merged_cell.ref for merged_cell in parser.merged_cells.mergeCell
+            ]
+        self.merged_cells = MergedCellIndex(self.merged_cell_ranges)
+        # openpyxl creates the cells of merged ranges in a full worksheet
+        for min_row, min_col, max_row, max_col in self.merged_cells.ranges:
+            self.max_row = max(self.max_row, max_row)
+            self.max_column = max(self.max_column, max_col)
+
+        self.row_dimensions = {}
+        for row, rd in parser.row_dimensions.items():
+            if "s" in rd:
+                rd["s"] = ws.parent._cell_styles[int(rd["s"])]
+            self.row_dimensions[int(row)] = RowDimension(ws, **rd)
+
+        self.column_dimensions = {}
+        for col, cd in parser.column_dimensions.items():
+            if "style" in cd:
+                cd["style"] = ws.parent._cell_styles[int(cd["style"])]
+            self.column_dimensions[col] = ColumnDimension(ws, **cd)
+
+        self.hyperlinks = self._bind_hyperlinks(parser.hyperlinks.hyperlink, rels)
+
+        self.images = []
+        if self.read_images:
+            for rel in rels.find(SpreadsheetDrawing._rel_type):
+                self.images.extend(find_zip_images(archive, rel.target))
+
+    def _bind_hyperlinks(self, links, rels):
+        # Same rules as openpyxl WorksheetReader.bind_hyperlinks
+        hyperlinks = {}
+        for link in links:
+            if link.id:
+                link.target = rels.get(link.id).Target
+            if ":" in link.ref:
+                for coords in rows_from_range(link.ref):
+                    for coord in coords:
+                        cell = coordinate_to_tuple(coord)
+                        if cell in self.merged_cells:
+                            continue
+                        hyperlinks[cell] = copy(link)
+            else:
+                cell = self.merged_cells.anchor(*coordinate_to_tuple(link.ref))
+                hyperlinks[cell] = link
+        return hyperlinks
+
+    def iter_rows(self):
+        """
+        Yield tuples of cells for the `min_row`:`max_row` x `min_column`:`max_column`
+        rectangle
+        """
+        if self.empty:
+            # openpyxl takes a bound of 0 for no bound
+            return iter(())
+        if not self.streaming:
+            ws = self.ws
+            bounds = (self.min_row, self.min_column, self.max_row, self.max_column)
+            if bounds == (1, 1, ws.max_row, ws.max_column):
+                # Unlike a bounded one, it yields nothing for an empty sheet
+                return ws.iter_rows()
+            return ws.iter_rows(
+                min_row=self.min_row,
+                max_row=self.max_row,
+                min_col=self.min_column,
+                max_col=self.max_column,
+            )
+        return self._iter_streaming_rows(
+            self.min_row, self.min_column, self.max_row, self.max_column
+        )
+
+    def _iter_streaming_rows(self, min_row, min_column, max_row, max_column):
+        ws = self.ws
+        hyperlinks = self.hyperlinks
+        width = max_column - min_column + 1
+        counter = min_row
+        with ws._get_source() as src:
+            parser_kwargs = dict(
+                min_row=min_row,
+                epoch=ws.parent.epoch,
+                date_formats=ws.parent._date_formats,
+                timedelta_formats=ws.parent._timedelta_formats,
+            )
+            if self.formulas:
+                parser = FormulaParser(src, ws._shared_strings, **parser_kwargs)
+            else:
+                parser = SheetParser(
+                    src,
+                    ws._shared_strings,
+                    data_only=ws.parent.data_only,
+                    **parser_kwargs,
+                )
+            for row_index, row in parser.parse():
+                if row_index < min_row:
+                    continue
+                if row_index > max_row:
+                    break
+                # Some rows are missing
+                for missing_index in range(counter, row_index):
+                    yield self._empty_row(missing_index, min_column, max_column)
+                counter = row_index + 1
+
+                cells = [None] * width
+                for cell in row:
+                    column = cell["column"]
+                    if column < min_column or column > max_column:
+                        continue
+                    formula = cell.pop("formula", None)
+                    stream_cell = cells[column - min_column] = StreamCell(ws, **cell)
+                    stream_cell.formula = formula
+                for column, cell in enumerate(cells, min_column):
+                    if cell is None:
+                        cell = cells[column - min_column] = StreamCell(
+                            ws, row_index, column, None, style_id=None
+                        )
+                    cell.hyperlink = hyperlinks.get((row_index, column))
+                yield tuple(cells)
+
+        for missing_index in range(counter, max_row + 1):
+            yield self._empty_row(missing_index, min_column, max_column)
+
+    def _empty_row(self, row_index, min_column, max_column):
+        hyperlinks = self.hyperlinks
+        cells = []
+        for column in range(min_column, max_column + 1):
+            cell = StreamCell(self.ws, row_index, column, None, style_id=None)
+            cell.hyperlink = hyperlinks.get((row_index, column))
+            cells.append(cell)
+        return tuple(cells)
+
+    def get_formula_cell(self, cell):
+        if not self.formulas:
+            return None
+        if self.streaming:
+            return cell.formula
+        return self.formulas.get((cell.row, cell.column))
+
+    def get_cells(self, cells):
+        """
+        Return ``{(row, column): cell}`` for the given cells of the sheet.
+
+        Merged cells are the same in both modes: openpyxl gives the top left
+        cell of a full worksheet the right and bottom borders of the bottom
+        right one, and replaces the other cells with :class:`MergedCell`
+        having only the outer borders of the top left one.
+        """
+        if not self.streaming:
+            return {(row, column): self.ws.cell(row, column) for row, column in cells}
+        found = self._read_cells(
+            {coord for coord in cells if coord not in self.merged_cells}
+        )
+        for coord, cell in found.items():
+            bounds = self.merged_cells.get_range(*coord)
+            if bounds is not None:
+                found[coord] = self._merge_anchor_borders(
+                    cell, self._get_edge_cell(bounds[2:])
+                )
+        found.update(
+            self.get_edge_cells(coord for coord in cells if coord not in found)
+        )
+        return found
+
+    def get_edge_cells(self, cells):
+        """
+        Return ``{(row, column): cell}`` for the given cells of merged ranges,
+        only their borders are the same as :meth:`get_cells` gives.
+        Streaming reads no cells, the styles are collected with the layout.
+        """
+        if not self.streaming:
+            return self.get_cells(cells)
+        anchors = {}
+        found = {}
+        for coord in cells:
+            bounds = self.merged_cells.get_range(*coord)
+            anchor = anchors.get(bounds)
+            if anchor is None:
+                anchor = anchors[bounds] = self._merge_anchor_borders(
+                    self._get_edge_cell(bounds[:2]), self._get_edge_cell(bounds[2:])
+                )
+            if coord == bounds[:2]:
+                found[coord] = anchor
+            else:
+                found[coord] = self._merged_cell(coord, bounds, anchor)
+        return found
+
+    def _get_edge_cell(self, coord):
+        if coord not in self.edge_styles:
+            # Not found by find_merged_cell_ranges
+            self.edge_styles[coord] = self._read_cells([coord])[coord]._style_id
+        row, column = coord
+        return StreamCell(self.ws, row, column, None, style_id=self.edge_styles[coord])
+
+    def _merge_anchor_borders(self, cell, end_cell):
+        # Same as openpyxl MergedCellRange._get_borders
+        border = cell.border + Border(
+            right=end_cell.border.right, bottom=end_cell.border.bottom
+        )
+        if border == cell.border:
+            return cell
+        wb = self.ws.parent
+        style = copy(cell.style_array)
+        style.borderId = wb._borders.add(border)
+        anchor = StreamCell(
+            self.ws,
+            cell.row,
+            cell.column,
+            cell.value,
+            data_type=cell.data_type,
+            style_id=wb._cell_styles.add(style),
+        )
+        anchor.hyperlink = cell.hyperlink
+        anchor.formula = cell.formula
+        return anchor
+
+    def _merged_cell(self, coord, bounds, anchor):
+        # Same as openpyxl MergedCellRange.format
+        row, column = coord
+        min_row, min_col, max_row, max_col = bounds
+        edges = {
+            "top": row == min_row,
+            "left": column == min_col,
+            "right": column == max_col,
+            "bottom": row == max_row,
+        }
+        # Comparing borders is slow, the cells of a range share a few styles
+        anchor_style = anchor.style_array
+        key = (anchor_style.borderId, anchor_style.protectionId, *edges.values())
+        style = self._merged_styles.get(key)
+        if style is None:
+            border = anchor.border
+            cell = MergedCell(self.ws, row, column)
+            for name, on_edge in edges.items():
+                side = getattr(border, name)
+                if on_edge and not (side and side.style is None):
+                    cell.border += Border(**{name: side})
+            cell.protection = copy(anchor.protection)
+            style = self._merged_styles[key] = cell._style
+        cell = MergedCell(self.ws, row, column)
+        cell._style = copy(style)
+        return cell
+
+    def _read_cells(self, cells):
+        found = {}
+        if not cells:
+            return found
+        columns_by_row = {}
+        for row, column in cells:
+            columns_by_row.setdefault(row, []).append(column)
+        min_column = min(column for row, column in cells)
+        max_column = max(column for row, column in cells)
+        rows = self._iter_streaming_rows(
+            min(columns_by_row), min_column, max(columns_by_row), max_column
+        )
+        for row in rows:
+            row_index = row[0].row
+            for column in columns_by_row.get(row_index, ()):
+                found[(row_index, column)] = row[column - min_column]
+        return found
+
+
+def get_seekable_source(filepath):
+    """Zip archives need random access, so read other streams into memory"""
+    if hasattr(filepath, "read"):
+        seekable = getattr(filepath, "seekable", None)
+        if not seekable or not seekable():
+            return io.BytesIO(filepath.read())
+    return filepath
+
+
+def get_file_size(filepath):
+    if isinstance(filepath, (str, os.PathLike)):
+        return os.path.getsize(filepath)
+    try:
+        pos = filepath.tell()
+        size = filepath.seek(0, os.SEEK_END)
+        filepath.seek(pos)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def get_sheet_dimensions(filepath):
+    """
+    Return ``(min_col, min_row, max_col, max_row)`` of each worksheet,
+    read from its ``<dimension ref>`` like a read-only workbook does,
+    or ``None`` when the sheet has none. Shared strings and styles
+    are not parsed.
+    """
+    dimensions = []
+    reader = ExcelReader(filepath, read_only=True)
+    try:
+        reader.read_manifest()
+        reader.read_workbook()
+        for sheet, rel in reader.parser.find_sheets():
+            if rel.target not in reader.valid_files or "chartsheet" in rel.Type:
+                continue
+            with reader.archive.open(rel.target) as src:
+                dimensions.append(WorkSheetParser(src, []).parse_dimensions())
+    finally:
+        reader.archive.close()
+    return dimensions
+
+
+def load_workbook(
+    filepath,
+    data_only=True,
+    streaming=None,
+    streaming_file_size=STREAMING_FILE_SIZE,
+    streaming_cell_count=STREAMING_CELL_COUNT,
+):
+    """
+    Load workbook in full or read-only (streaming) mode.
+
+    :param streaming: ``True`` - always stream; ``False`` - never;
+        ``None`` - stream when the file is bigger than `streaming_file_size`
+        bytes or any sheet spans more than `streaming_cell_count` cells.
+    """
+    if streaming is None:
+        size = get_file_size(filepath)
+        streaming = size is not None and size > streaming_file_size
+        if not streaming:
+            for dimensions in get_sheet_dimensions(filepath):
+                if dimensions is None:
+                    continue
+                min_col, min_row, max_col, max_row = dimensions
+                if (max_row or 0) * (max_col or 0) > streaming_cell_count:
+                    streaming = True
+                    break
+    return openpyxl.load_workbook(filepath, read_only=streaming, data_only=data_only)
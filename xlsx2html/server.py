@@ -0,0 +1,457 @@
+"""
+Conversion server: workbooks are posted over HTTP and converted by worker
+processes forked after the locales are loaded and the format caches warmed up,
+so a request skips the startup of a fresh process::
+
+    python -m xlsx2html serve --port 8730 --workers 4 --locale en --locale ru
+    python -m xlsx2html serve --unix-socket /run/xlsx2html.sock
+
+    curl --data-binary @report.xlsx 'http://127.0.0.1:8730/?locale=ru&sheet=-1'
+    curl --unix-socket /run/xlsx2html.sock --data-binary @report.xlsx http://localhost/
+
+Query parameters are :func:`xlsx2html.xlsx2html` options, see :data:`QUERY_OPTIONS`.
+The html is streamed back in chunks as the rows are converted.
+``GET /status`` returns the pid, conversions and format cache counters of
+the worker that answers.
+"""
+
+import argparse
+import datetime
+import gc
+import http.server
+import io
+import json
+import os
+import re
+import signal
+import socketserver
+import stat
+import sys
+from urllib.parse import parse_qsl, urlsplit
+
+from babel import UnknownLocaleError
+
+from . import __version__
+from .batch import parse_sheet
+from .core import iter_xlsx2html, xlsx2html
+from .format import cache_info
+from .format.number import get_locale
+
+DEFAULT_PORT = 8730
+# Bytes of a posted workbook
+MAX_SIZE = 100 * 1024 * 1024
+# Rows are written in chunks of about this many bytes
+CHUNK_SIZE = 64 * 1024
+
+# Width, style or color of a CSS border
+BORDER_TOKEN = (
+    r"(?:[0-9]*\.?[0-9]+(?:px|pt|pc|em|rem|ex|ch|mm|cm|in)?"
+    r"|[a-zA-Z]+"
+    r"|#[0-9a-fA-F]{3,8}"
+    r"|(?:rgb|hsl)a?\([0-9a-zA-Z%., /+-]*\))"
+)
+BORDER_RE = re.compile(r" *{0}(?: +{0}){{0,2}} *".format(BORDER_TOKEN))
+
+
+def parse_bool(value):
+    """
+    >>> parse_bool("1"), parse_bool("false")
+    (True, False)
+    """
+    value = value.lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ValueError("not a boolean: %r" % value)
+
+
+def parse_locale(value):
+    # Otherwise only raised by the first cell with a number format
+    try:
+        get_locale(value)
+    except (ValueError, UnknownLocaleError):
+        raise ValueError("unknown locale: %r" % value) from None
+    return value
+
+
+def parse_images(value):
+    # "assets" would write files on the server
+    if value not in ("inline", "shared", "none"):
+        raise ValueError("images must be inline, shared or none")
+    return value
+
+
+def parse_count(value):
+    """
+    >>> parse_count("10")
+    10
+    """
+    count = int(value)
+    if count < 0:
+        raise ValueError("negative: %r" % value)
+    return count
+
+
+def parse_border(value):
+    """
+    The value goes into the style attribute of the cells, so only
+    a width, a style and a color are allowed.
+
+    >>> parse_border("1px solid rgb(0, 0, 255)")
+    '1px solid rgb(0, 0, 255)'
+    """
+    if not BORDER_RE.fullmatch(value):
+        raise ValueError("not a css border: %r" % value)
+    return value
+
+
+def parse_streaming(value):
+    return None if value == "auto" else parse_bool(value)
+
+
+QUERY_OPTIONS = {
+    "locale": parse_locale,
+    "sheet": parse_sheet,
+    "parse_formula": parse_bool,
+    "css_classes": parse_bool,
+    "default_cell_border": parse_border,
+    "images": parse_images,
+    "trim_empty": parse_bool,
+    "max_rows": parse_count,
+    "max_columns": parse_count,
+    "streaming": parse_streaming,
+}
+
+
+def parse_options(query, defaults=None):
+    """
+    Return :func:`xlsx2html.iter_xlsx2html` options of the query string.
+    A repeated ``sheet`` gives a list of sheets.
+
+    >>> parse_options("locale=ru&sheet=0&sheet=Totals&css_classes=1")
+    {'locale': 'ru', 'css_classes': True, 'sheet': [0, 'Totals']}
+    """
+    options = dict(defaults or {})
+    sheets = []
+    for name, value in parse_qsl(query, keep_blank_values=True):
+        parse = QUERY_OPTIONS.get(name)
+        if parse is None:
+            raise ValueError("unknown option: %s" % name)
+        try:
+            value = parse(value)
+        except ValueError:
+            raise ValueError("invalid %s: %r" % (name, value)) from None
+        if name == "sheet":
+            sheets.append(value)
+        else:
+            options[name] = value
+    if sheets:
+        options["sheet"] = sheets[0] if len(sheets) == 1 else sheets
+    return options
+
+
+def iter_batches(chunks, size=CHUNK_SIZE):
+    """Join chunks of bytes up to about `size`"""
+    batch = []
+    length = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b"".join(batch)
+            batch = []
+            length = 0
+    if batch:
+        yield b"".join(batch)
+
+
+def make_warm_up_workbook():
+    """
+    Return a workbook with a cell of each builtin number format,
+    styles, a merged range and a hyperlink
+    """
+    import openpyxl
+    from openpyxl.styles import Border, Font, PatternFill, Side
+    from openpyxl.styles.numbers import (
+        BUILTIN_FORMATS,
+        is_date_format,
+        is_timedelta_format,
+    )
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    side = Side(style="thin", color="FF0000")
+    for row, number_format in enumerate(BUILTIN_FORMATS.values(), 1):
+        if is_timedelta_format(number_format):
+            value = datetime.timedelta(hours=30, minutes=15)
+        elif is_date_format(number_format):
+            value = datetime.datetime(2020, 2, 3, 4, 5, 6)
+        elif number_format == "@":
+            value = "text"
+        else:
+            value = -1234.5
+        cell = ws.cell(row, 1, value)
+        cell.number_format = number_format
+        cell.font = Font(bold=True, color="0000FF")
+        cell.fill = PatternFill("solid", fgColor="FFFF00")
+        cell.border = Border(left=side, right=side, top=side, bottom=side)
+    ws.merge_cells("B1:C2")
+    ws["B1"].hyperlink = "https://example.com"
+    fp = io.BytesIO()
+    wb.save(fp)
+    return fp.getvalue()
+
+
+def warm_up(locales=("en",)):
+    """
+    Load the locales and convert a small workbook with each of them
+    in both modes: babel data, number and date formats and the code
+    of the conversion are loaded once, before the workers are forked.
+    """
+    workbook = make_warm_up_workbook()
+    for locale in locales:
+        get_locale(locale)
+        for streaming in (False, True):
+            xlsx2html(io.BytesIO(workbook), locale=locale, streaming=streaming).close()
+
+
+class ConversionHandler(http.server.BaseHTTPRequestHandler):
+    # Chunked responses
+    protocol_version = "HTTP/1.1"
+    server_version = "xlsx2html/" + __version__
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "-"
+
+    def send_text(self, status, text, content_type="text/plain; charset=utf-8"):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_bad_request(self, explain):
+        # The reason phrase stays fixed, the text of the client or the workbook
+        # goes in the escaped body
+        self.send_error(400, explain=explain)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/status":
+            self.send_error(404)
+            return
+        status = self.server.get_status()
+        self.send_text(200, json.dumps(status), "application/json")
+
+    def do_POST(self):
+        try:
+            options = parse_options(
+                urlsplit(self.path).query, {"locale": self.server.default_locale}
+            )
+        except ValueError as e:
+            self.send_bad_request(str(e))
+            return
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            self.send_error(411)
+            return
+        if int(length) > self.server.max_size:
+            self.send_error(413)
+            return
+        source = io.BytesIO(self.rfile.read(int(length)))
+
+        chunks = iter_batches(iter_xlsx2html(source, encoding="utf-8", **options))
+        try:
+            # Most errors are raised on reading the workbook, before any html
+            first_chunk = next(chunks, b"")
+        except Exception as e:
+            self.server.failures += 1
+            self.send_bad_request("%s: %s" % (type(e).__name__, e))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self.write_chunk(first_chunk)
+            for chunk in chunks:
+                self.write_chunk(chunk)
+        except Exception as e:
+            # Without the last chunk the client sees an incomplete response
+            self.server.failures += 1
+            self.close_connection = True
+            self.log_error("conversion failed: %s: %s", type(e).__name__, e)
+            chunks.close()
+            return
+        self.wfile.write(b"0\r\n\r\n")
+        self.server.conversions += 1
+
+    def write_chunk(self, chunk):
+        if chunk:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+
+
+class ConversionServerMixin:
+    default_locale = "en"
+    max_size = MAX_SIZE
+    conversions = 0
+    failures = 0
+
+    def get_status(self):
+        return {
+            "pid": os.getpid(),
+            "conversions": self.conversions,
+            "failures": self.failures,
+            "caches": {
+                name: {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+                for name, info in cache_info().items()
+            },
+        }
+
+
+class ConversionServer(ConversionServerMixin, http.server.HTTPServer):
+    pass
+
+
+class UnixConversionServer(ConversionServerMixin, socketserver.UnixStreamServer):
+    def server_bind(self):
+        path = self.server_address
+        # Left by a server that was killed
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        super().server_bind()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def make_server(address, default_locale="en", max_size=MAX_SIZE):
+    """
+    Bind a server to ``(host, port)`` or the path of a Unix socket
+
+    :param default_locale: locale of the requests without one
+    :param max_size: largest workbook accepted, in bytes
+    """
+    if isinstance(address, str):
+        server = UnixConversionServer(address, ConversionHandler)
+    else:
+        server = ConversionServer(address, ConversionHandler)
+    server.default_locale = default_locale
+    server.max_size = max_size
+    return server
+
+
+def format_address(server):
+    if isinstance(server.server_address, str):
+        return server.server_address
+    host, port = server.server_address[:2]
+    return "http://%s:%s/" % (host, port)
+
+
+def serve(server, workers=None, locales=("en",), on_ready=None):
+    """
+    Warm up, then serve with `workers` forked processes until SIGTERM or
+    SIGINT. Workers that exit are replaced.
+
+    :param workers: ``0`` - serve in this process, by default one per cpu
+    :param on_ready: called when the server accepts requests
+    """
+    warm_up(locales)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not hasattr(os, "fork"):
+        workers = 0
+    if not workers:
+        if on_ready is not None:
+            on_ready()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+        return
+
+    # Objects of the warm up are not moved by the gc of the workers,
+    # their memory pages stay shared
+    gc.freeze()
+    children = set()
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for _ in range(workers):
+            children.add(fork_worker(server))
+        if on_ready is not None:
+            on_ready()
+        while True:
+            pid, _ = os.wait()
+            if pid in children:
+                children.remove(pid)
+                children.add(fork_worker(server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        server.server_close()
+
+
+def fork_worker(server):
+    pid = os.fork()
+    if pid:
+        return pid
+    # Stopped by the parent, also on ctrl+c
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m xlsx2html serve",
+        description="Convert workbooks posted over HTTP",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix-socket", help="listen on a Unix socket instead")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="0 - serve in one process"
+    )
+    parser.add_argument(
+        "--locale",
+        action="append",
+        help="load on startup, the first one is the default, 'en' by default",
+    )
+    parser.add_argument(
+        "--max-size", type=int, default=MAX_SIZE // 1024 // 1024, help="MiB"
+    )
+    options = parser.parse_args(args)
+
+    locales = options.locale or ["en"]
+    address = options.unix_socket or (options.host, options.port)
+    server = make_server(
+        address, default_locale=locales[0], max_size=options.max_size * 1024 * 1024
+    )
+
+    def on_ready():
+        print("Serving on %s" % format_address(server), flush=True)
+
+    serve(server, workers=options.workers, locales=locales, on_ready=on_ready)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Where the time of a conversion goes::
+
+    stats = ConversionStats()
+    xlsx2html("example.xlsx", "example.html", stats=stats)
+    print(stats.format_report())
+
+Phases are timed exclusively: the time of a nested phase (e.g. ``format_cell``
+while rendering a row) is not counted in the outer one.
+"""
+
+import contextlib
+import time
+from collections import defaultdict
+
+# Phases timed for each cell, the callback is not called for them
+CELL_PHASES = ("format_cell", "styles")
+
+
+class ConversionStats:
+    """
+    Wall time per phase and per sheet, counters of cells, styled cells,
+    merged ranges, images and hyperlinks and the time spent formatting
+    each number format.
+
+    :param callback: called with ``(phase, sheet title or None, seconds)``
+        when a phase ends, except :data:`CELL_PHASES`. For the phases timed
+        with :meth:`iter_phase` it is called once, after the last item.
+    """
+
+    def __init__(self, callback=None, clock=time.perf_counter):
+        self.callback = callback
+        self.clock = clock
+        # Current sheet title
+        self.sheet = None
+        self.phases = defaultdict(float)
+        self.sheets = defaultdict(lambda: defaultdict(float))
+        self.counters = defaultdict(int)
+        self.sheet_counters = defaultdict(lambda: defaultdict(int))
+        # number format: [cells, seconds]
+        self.formats = defaultdict(lambda: [0, 0.0])
+        # [phase, segment start, phase start]
+        self._stack = []
+
+    def _add(self, phase, seconds):
+        self.phases[phase] += seconds
+        self.sheets[self.sheet][phase] += seconds
+
+    def start(self, phase):
+        now = self.clock()
+        if self._stack:
+            # The outer phase is paused
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        self._stack.append([phase, now, now])
+
+    def stop(self, number_format=None, notify=True):
+        """End the innermost phase, return its wall time"""
+        now = self.clock()
+        phase, segment_start, started = self._stack.pop()
+        self._add(phase, now - segment_start)
+        if self._stack:
+            self._stack[-1][1] = now
+        if number_format is not None:
+            stat = self.formats[number_format]
+            stat[0] += 1
+            stat[1] += now - segment_start
+        seconds = now - started
+        if notify and self.callback is not None and phase not in CELL_PHASES:
+            self.callback(phase, self.sheet, seconds)
+        return seconds
+
+    def phase(self, phase):
+        """Context manager timing the block as the phase"""
+        return _Phase(self, phase)
+
+    def iter_phase(self, phase, iterable):
+        """Time getting each item of the iterable as the phase"""
+        iterator = iter(iterable)
+        seconds = 0
+        while True:
+            self.start(phase)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                seconds += self.stop(notify=False)
+            yield item
+        if self.callback is not None:
+            self.callback(phase, self.sheet, seconds)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+        self.sheet_counters[self.sheet][name] += value
+
+    def top_formats(self, limit=10):
+        """
+        Return ``[(number format, cells, seconds)]`` by total time
+
+        >>> stats = ConversionStats()
+        >>> stats.formats["0.00"] = [10, 0.5]
+        >>> stats.formats["General"] = [100, 0.1]
+        >>> stats.top_formats(1)
+        [('0.00', 10, 0.5)]
+        """
+        formats = [
+            (fmt, cells, seconds) for fmt, (cells, seconds) in self.formats.items()
+        ]
+        formats.sort(key=lambda item: item[2], reverse=True)
+        return formats[:limit]
+
+    def report(self, limit=10):
+        return {
+            "phases": dict(self.phases),
+            "sheets": {
+                sheet: dict(phases)
+                for sheet, phases in self.sheets.items()
+                if sheet is not None
+            },
+            "counters": dict(self.counters),
+            "sheet_counters": {
+                sheet: dict(counters)
+                for sheet, counters in self.sheet_counters.items()
+                if sheet is not None
+            },
+            "formats": self.top_formats(limit),
+        }
+
+    def format_report(self, limit=10):
+        lines = ["Phases:"]
+        for phase, seconds in sorted(
+            self.phases.items(), key=lambda item: item[1], reverse=True
+        ):
+            lines.append("  %-20s %8.3fs" % (phase, seconds))
+        for sheet, phases in self.sheets.items():
+            if sheet is None:
+                continue
+            lines.append("Sheet %s: %.3fs" % (sheet, sum(phases.values())))
+        counters = ["%s=%s" % item for item in sorted(self.counters.items())]
+        lines.append("Counters: %s" % ", ".join(counters))
+        if self.formats:
+            lines.append("Number formats:")
+            for fmt, cells, seconds in self.top_formats(limit):
+                lines.append("  %8.3fs %8d cells  %s" % (seconds, cells, fmt))
+        return "\n".join(lines)
+
+
+class NullStats:
+    """Does nothing, for the phases timed once per sheet when there are no stats"""
+
+    def phase(self, phase):
+        return contextlib.nullcontext()
+
+    def count(self, name, value=1):
+        pass
+
+
+NO_STATS = NullStats()
+
+
+class _Phase:
+    __slots__ = ("stats", "name")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.stats.start(self.name)
+        return self.stats
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.stop()
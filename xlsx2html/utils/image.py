@@ -1,17 +1,116 @@
 import base64
+import hashlib
 import mimetypes
+import os
 
 from ..compat import BinaryIO
 
+# Multiple of 3, so base64 of each chunk has no padding and chunks can be joined
+DATAURI_CHUNK_SIZE = 3 * 64 * 1024
+
 
 class FileNotFoundError(Exception):
     pass
 
 
-def bytes_to_datauri(fp: BinaryIO, name):
-    """Convert a file (specified by a path) into a data URI."""
+def iter_datauri(fp: BinaryIO, name, chunk_size=DATAURI_CHUNK_SIZE):
+    """Yield a data URI of the file piece by piece, without reading it whole."""
     mime, _ = mimetypes.guess_type(name)
+    yield "data:%s;base64," % mime
     fp.seek(0)
-    data = fp.read()
-    data64 = b"".join(base64.encodebytes(data).splitlines())
-    return "data:%s;base64,%s" % (mime, data64.decode("utf-8"))
+    for data in iter(lambda: fp.read(chunk_size), b""):
+        yield base64.b64encode(data).decode("utf-8")
+
+
+def bytes_to_datauri(fp: BinaryIO, name):
+    """Convert a file (specified by a path) into a data URI."""
+    return "".join(iter_datauri(fp, name))
+
+
+class ImageStore:
+    """
+    Unique images of a document, by content hash.
+
+    ``mode="assets"`` - each image is written once to ``assets_dir``
+    and referenced as ``<assets_url><hash>.<ext>``.
+    ``mode="shared"`` - the data URI of each image is written once,
+    as a css class, see :meth:`iter_styles`.
+    """
+
+    modes = ("shared", "assets")
+    class_prefix = "x2h-img-"
+
+    def __init__(self, mode="shared", assets_dir="assets", assets_url=None):
+        if mode not in self.modes:
+            raise ValueError("Unknown image mode %r" % mode)
+        self.mode = mode
+        self.assets_dir = assets_dir
+        if assets_url is None:
+            assets_url = os.path.basename(os.path.normpath(assets_dir)) + "/"
+        self.assets_url = assets_url
+        self.names = {}
+        # Shared images without a written css class yet
+        self.pending = {}
+
+    def add(self, fp: BinaryIO, name):
+        """Return the key of the image, the same for the same content"""
+        digest = hashlib.sha1()
+        fp.seek(0)
+        for data in iter(lambda: fp.read(DATAURI_CHUNK_SIZE), b""):
+            digest.update(data)
+        key = digest.hexdigest()
+        if key not in self.names:
+            self.names[key] = key + os.path.splitext(name)[1].lower()
+            if self.mode == "assets":
+                self._write_asset(key, fp)
+            else:
+                self.pending[key] = (fp, name)
+        return key
+
+    def _write_asset(self, key, fp):
+        path = os.path.join(self.assets_dir, self.names[key])
+        if os.path.exists(path):
+            return
+        os.makedirs(self.assets_dir, exist_ok=True)
+        fp.seek(0)
+        with open(path, "wb") as f:
+            for data in iter(lambda: fp.read(DATAURI_CHUNK_SIZE), b""):
+                f.write(data)
+
+    def get_src(self, key):
+        return self.assets_url + self.names[key]
+
+    def get_class(self, key):
+        return self.class_prefix + key
+
+    def iter_styles(self):
+        """Yield ``<style>`` blocks of the shared images added since the last call"""
+        while self.pending:
+            key = next(iter(self.pending))
+            fp, name = self.pending.pop(key)
+            yield '\n<style>.%s {background-image: url("' % self.get_class(key)
+            yield from iter_datauri(fp, name)
+            yield '")}</style>'
+
+
+class DeferredImageStore(ImageStore):
+    """
+    Shared images of a sheet rendered in another process. Their css is not
+    written before the table, the images are sent back with :meth:`pop_images`
+    for the store of the document to write each of them once.
+    """
+
+    def __init__(self):
+        super().__init__("shared")
+
+    def iter_styles(self):
+        return iter(())
+
+    def pop_images(self):
+        """Return ``[(name, data)]`` of the images added since the last call"""
+        images = []
+        for fp, name in self.pending.values():
+            fp.seek(0)
+            images.append((name, fp.read()))
+        self.pending.clear()
+        return images